@@ -0,0 +1,300 @@
+"""
+Local stand-ins for the services the pipeline talks to, for benchmarks:
+synthetic RSS/Atom feeds, a Reddit OAuth API and Ollama's /api/generate.
+Every server runs on 127.0.0.1 with an ephemeral port in a daemon thread.
+"""
+import re
+import json
+import time
+import zlib
+import random
+import threading
+import http.server
+from email.utils import formatdate
+
+# Vocabulary for synthetic article text; includes keywords from sources.json
+# so most articles pass the keyword filter
+WORDS = ('AI', 'marathon', 'training', 'running', 'Garmin', 'model', 'LLM', 'heart', 'rate', 'recovery',
+         'VO2max', 'data', 'coach', 'sleep', 'zone', 'race', 'pace', 'sensor', 'wearable', 'athlete',
+         'research', 'study', 'performance', 'nutrition', 'strength', 'agent', 'benchmark', 'startup')
+
+# Filler vocabulary, large enough that synthetic articles are not near-duplicates
+_SYLLABLES = ('ka', 'lo', 'mi', 'ren', 'to', 'vu', 'sel', 'dar', 'pin', 'qua', 'ber', 'nox')
+FILLER = tuple(a + b + c for a in _SYLLABLES for b in _SYLLABLES for c in _SYLLABLES)
+
+def synthetic_text(rng, words):
+    """Filler words with about one keyword-ish word in five"""
+    return ' '.join(rng.choice(WORDS) if rng.random() < 0.2 else rng.choice(FILLER) for _ in range(words))
+
+class _FakeServer:
+    """ThreadingHTTPServer on an ephemeral port; subclasses provide the handler"""
+    handler_class = None
+
+    def __init__(self):
+        server = self
+        handler = type('Handler', (self.handler_class,), {'fake': server})
+        self.httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self.httpd.daemon_threads = True
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+class _QuietHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'   # Keep-alive, like the real services
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_body(self, code, body, content_type, headers=None):
+        self.send_response(code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+class _FeedHandler(_QuietHandler):
+    def do_GET(self):
+        self.fake.count_request()
+        m = re.match(r'^/feed/(\d+)\.(rss|atom)$', self.path)
+        if not m:
+            self.send_body(404, b'not found', 'text/plain')
+            return
+        if self.fake.latency:
+            time.sleep(self.fake.latency)
+        feed_id, kind = int(m.group(1)), m.group(2)
+        etag = f'"feed-{feed_id}-{self.fake.revision}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = self.fake.render(feed_id, kind).encode('utf-8')
+        content_type = 'application/atom+xml' if kind == 'atom' else 'application/rss+xml'
+        self.send_body(200, body, content_type + '; charset=utf-8', {'ETag': etag})
+
+class FakeFeedServer(_FakeServer):
+    """
+    Serves /feed/<n>.rss and /feed/<n>.atom, each with items_per_feed
+    entries (or item_counts[n]) of about words_per_item words, after latency
+    seconds. ETags change whenever revision is bumped, so conditional GETs
+    can be exercised.
+    """
+    handler_class = _FeedHandler
+
+    def __init__(self, items_per_feed=10, words_per_item=120, latency=0.0, seed=1):
+        super().__init__()
+        self.items_per_feed = items_per_feed
+        self.words_per_item = words_per_item
+        self.latency = latency
+        self.seed = seed
+        self.revision = 0
+        self.item_counts = {}   # feed id -> entries, overriding items_per_feed
+
+    def feed_url(self, feed_id, kind='rss'):
+        return f"{self.url}/feed/{feed_id}.{kind}"
+
+    def render(self, feed_id, kind):
+        rng = random.Random(f"{self.seed}-{feed_id}-{self.revision}")
+        now = time.time()
+        items = []
+        for n in range(self.item_counts.get(feed_id, self.items_per_feed)):
+            title = f"{synthetic_text(rng, 8)} #{feed_id}-{n}"
+            body = f"<p>{synthetic_text(rng, self.words_per_item)}</p>"
+            link = f"https://example.com/{feed_id}/{self.revision}/{n}"
+            published = now - n * 3600
+            if kind == 'atom':
+                stamp = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(published))
+                items.append(f"<entry><title>{title}</title><link href=\"{link}\"/><id>{link}</id>"
+                             f"<updated>{stamp}</updated><content type=\"html\"><![CDATA[{body}]]></content></entry>")
+            else:
+                items.append(f"<item><title>{title}</title><link>{link}</link><guid>{link}</guid>"
+                             f"<pubDate>{formatdate(published)}</pubDate>"
+                             f"<description><![CDATA[{body}]]></description></item>")
+        if kind == 'atom':
+            return ('<?xml version="1.0" encoding="utf-8"?><feed xmlns="http://www.w3.org/2005/Atom">'
+                    f"<title>Bench feed {feed_id}</title>{''.join(items)}</feed>")
+        return ('<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel>'
+                f"<title>Bench feed {feed_id}</title>{''.join(items)}</channel></rss>")
+
+class _OllamaHandler(_QuietHandler):
+    def do_POST(self):
+        self.fake.count_request()
+        payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        fake = self.fake
+        if fake.failure_rate and fake.rng_random() < fake.failure_rate:
+            self.send_body(500, b'{"error": "simulated failure"}', 'application/json')
+            return
+
+        tokens = fake.response_tokens(payload.get('prompt', ''))
+        prompt_tokens = len(payload.get('prompt', '')) // 4
+        if fake.prompt_latency:
+            time.sleep(fake.prompt_latency)
+        if not payload.get('stream', True):
+            fake.pace(len(tokens))
+            body = json.dumps({'model': payload.get('model'), 'response': ''.join(tokens), 'done': True,
+                               'prompt_eval_count': prompt_tokens, 'eval_count': len(tokens)})
+            self.send_body(200, body.encode('utf-8'), 'application/json')
+            return
+
+        # NDJSON stream, one token per line, chunked like Ollama's
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        try:
+            for token in tokens:
+                fake.pace(1)
+                self._chunk(json.dumps({'response': token, 'done': False}) + '\n')
+            self._chunk(json.dumps({'response': '', 'done': True, 'prompt_eval_count': prompt_tokens,
+                                    'eval_count': len(tokens)}) + '\n')
+            self.wfile.write(b'0\r\n\r\n')
+        except (BrokenPipeError, ConnectionResetError):
+            pass   # Client stopped reading once it had complete JSON
+
+    def _chunk(self, text):
+        data = text.encode('utf-8')
+        self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b'\r\n')
+        self.wfile.flush()
+
+class FakeOllama(_FakeServer):
+    """
+    Ollama /api/generate stand-in. Answers single-article and batch prompts
+    with valid enrichment JSON, generated at tokens_per_second (0 = as fast
+    as possible) after prompt_latency seconds; failure_rate of requests get
+    an HTTP 500.
+    """
+    handler_class = _OllamaHandler
+
+    def __init__(self, tokens_per_second=0, prompt_latency=0.0, failure_rate=0.0, seed=1):
+        super().__init__()
+        self.tokens_per_second = tokens_per_second
+        self.prompt_latency = prompt_latency
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    @property
+    def api_url(self):
+        return f"{self.url}/api/generate"
+
+    def rng_random(self):
+        with self._rng_lock:
+            return self._rng.random()
+
+    def pace(self, tokens):
+        if self.tokens_per_second:
+            time.sleep(tokens / self.tokens_per_second)
+
+    def response_tokens(self, prompt):
+        m = re.search(r'Analyze each of the following (\d+) articles', prompt)
+        count = int(m.group(1)) if m else None
+        titles = re.findall(r'Title: (.*)', prompt)
+        items = []
+        for n in range(count or 1):
+            title = titles[n] if n < len(titles) else 'Untitled'
+            item = {
+                'title_zh': f"[译] {title[:60]}",
+                'summary_zh': '这是基准测试生成的摘要。' * 6,
+                'one_sentence_comment': '基准测试点评。',
+                'score': 5 + n % 5,
+                'tags': ['AI', 'Bench'],
+                'category': 'AI前沿',
+            }
+            if count:
+                item = {'id': n + 1, **item}
+            items.append(item)
+        text = json.dumps(items if count else items[0], ensure_ascii=False)
+        # About four characters per token, like real model output
+        return [text[i:i + 4] for i in range(0, len(text), 4)]
+
+class _RedditHandler(_QuietHandler):
+    def do_POST(self):
+        self.fake.count_request()
+        if self.path.startswith('/api/v1/access_token'):
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            body = json.dumps({'access_token': 'bench-token', 'token_type': 'bearer', 'expires_in': 86400,
+                               'scope': '*'})
+            self.send_body(200, body.encode('utf-8'), 'application/json')
+        else:
+            self.send_body(404, b'{}', 'application/json')
+
+    def do_GET(self):
+        self.fake.count_request()
+        m = re.match(r'^/r/([^/]+)/hot', self.path)
+        if not m:
+            self.send_body(404, b'{}', 'application/json')
+            return
+        if self.fake.latency:
+            time.sleep(self.fake.latency)
+        limit = re.search(r'[?&]limit=(\d+)', self.path)
+        limit = int(limit.group(1)) if limit else 25
+        body = json.dumps(self.fake.listing(m.group(1).split('+'), limit))
+        self.send_body(200, body.encode('utf-8'), 'application/json; charset=UTF-8', {
+            'x-ratelimit-remaining': '999', 'x-ratelimit-used': '1', 'x-ratelimit-reset': '600'})
+
+class FakeReddit(_FakeServer):
+    """
+    Reddit OAuth API stand-in for PRAW: token endpoint plus /r/<a+b>/hot
+    listings with posts_per_sub (or post_counts[name]) posts per subreddit,
+    interleaved for combined listings. Point PRAW at it with oauth_url /
+    reddit_url.
+    """
+    handler_class = _RedditHandler
+
+    def __init__(self, posts_per_sub=10, words_per_post=80, latency=0.0, seed=1):
+        super().__init__()
+        self.posts_per_sub = posts_per_sub
+        self.words_per_post = words_per_post
+        self.latency = latency
+        self.seed = seed
+        self.post_counts = {}   # subreddit -> posts, overriding posts_per_sub
+
+    def listing(self, subreddits, limit):
+        now = time.time()
+        children = []
+        counts = {sub: self.post_counts.get(sub, self.posts_per_sub) for sub in subreddits}
+        for n in range(max(counts.values(), default=0)):
+            for sub in subreddits:
+                if n >= counts[sub]:
+                    continue
+                rng = random.Random(f"{self.seed}-{sub}-{n}")
+                post_id = format(zlib.crc32(f"{sub}-{n}".encode('utf-8')), 'x')
+                children.append({'kind': 't3', 'data': {
+                    'id': post_id,
+                    'name': f"t3_{post_id}",
+                    'title': f"{synthetic_text(rng, 8)} ({sub} {n})",
+                    'selftext': synthetic_text(rng, self.words_per_post),
+                    'url': f"https://example.org/{sub}/{n}",
+                    'permalink': f"/r/{sub}/comments/{post_id}/post_{n}/",
+                    'subreddit': sub,
+                    'created_utc': now - n * 1800,
+                    'score': rng.randint(0, 2000),
+                    'num_comments': rng.randint(0, 300),
+                    'stickied': False,
+                }})
+        return {'kind': 'Listing', 'data': {'children': children[:limit], 'after': None, 'before': None}}
@@ -0,0 +1,240 @@
+"""
+Offline end-to-end benchmark of the pipeline against local fake services.
+
+    python -m bench.run_bench                          # 10, 100, 1000, 10000 articles
+    python -m bench.run_bench --scales 100,1000 --tokens-per-second 200 --llm-failure-rate 0.05
+    python -m bench.run_bench --output new.json --baseline old.json   # exit 1 on regressions
+
+For every scale the stages run in pipeline order on fresh state (temporary
+DATA_DIR and output directory) and report wall time, throughput and peak
+traced Python memory. tracemalloc slows allocation-heavy stages several
+times over, so timings come from an untraced pass and peak memory from a
+second, traced pass (skipped with --no-memory).
+"""
+import os
+import sys
+import json
+import math
+import time
+import shutil
+import argparse
+import datetime
+import tempfile
+import tracemalloc
+import contextlib
+
+import praw
+
+from src.config import Config
+import src.generator.html_builder as html_builder
+from src.collector.rss_fetcher import RSSFetcher
+from src.collector.reddit_fetcher import RedditFetcher
+from src.processor.content_extractor import ContentExtractor
+from src.processor.keyword_matcher import KeywordMatcher
+from src.processor.dedup import Deduplicator
+from src.processor.ranker import Ranker
+from src.processor.summarizer import Summarizer
+from src.storage.article_store import ArticleStore
+from bench.fake_servers import FakeFeedServer, FakeOllama, FakeReddit
+
+DEFAULT_SCALES = (10, 100, 1000, 10000)
+REDDIT_SHARE = 0.2            # Part of the articles that comes from Reddit
+BENCH_KEYWORDS = ['AI', 'marathon', 'Garmin', 'LLM', 'recovery', 'VO2max']
+
+class BenchRedditFetcher(RedditFetcher):
+    """RedditFetcher whose PRAW clients talk to FakeReddit"""
+    def __init__(self, api_url):
+        self.api_url = api_url
+        super().__init__()
+
+    def _create_client(self):
+        return praw.Reddit(client_id='bench', client_secret='bench', user_agent='bench',
+                           oauth_url=self.api_url, reddit_url=self.api_url)
+
+def configure(work_dir, feeds, reddit_subs, ollama):
+    """Point Config and HtmlBuilder at the fake services and a scratch directory"""
+    data_dir = os.path.join(work_dir, 'data')
+    Config.DATA_DIR = data_dir
+    Config.ARTICLE_DB_PATH = os.path.join(data_dir, 'articles.db')
+    Config.LLM_CACHE_PATH = os.path.join(data_dir, 'llm_cache.db')
+    Config.JINJA_CACHE_DIR = os.path.join(data_dir, 'jinja_cache')
+    Config.RSS_FEEDS = feeds
+    Config.REDDIT_SUBREDDITS = reddit_subs
+    Config.KEYWORDS = BENCH_KEYWORDS
+    Config.REDDIT_CLIENT_ID = Config.REDDIT_CLIENT_SECRET = 'bench'
+    Config.RSS_CONDITIONAL_GET = False
+    Config.OLLAMA_API_URL = ollama.api_url
+    html_builder.OUTPUT_DIR = os.path.join(work_dir, 'output')
+
+class StageTimer:
+    """Runs stages with stdout silenced, recording time, throughput and peak memory"""
+    def __init__(self, scale, trace_memory, verbose):
+        self.scale = scale
+        self.trace_memory = trace_memory
+        self.verbose = verbose
+        self.results = []
+
+    def run(self, stage, fn, items_of=len):
+        """fn() -> result; items_of(result) is the number of items the stage produced"""
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        with open(os.devnull, 'w') as devnull:
+            sink = contextlib.nullcontext() if self.verbose else contextlib.redirect_stdout(devnull)
+            start = time.perf_counter()
+            with sink:
+                result = fn()
+            seconds = time.perf_counter() - start
+        items = items_of(result) if items_of else 0
+        self.results.append({
+            'scale': self.scale,
+            'stage': stage,
+            'seconds': round(seconds, 4),
+            'items': items,
+            'items_per_second': round(items / seconds, 1) if seconds > 0 else 0.0,
+            'peak_mb': round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2) if self.trace_memory else None,
+        })
+        return result
+
+def run_scale(scale, servers, args, trace_memory=False):
+    feed_server, reddit_server, ollama = servers
+    # Exactly scale articles: the last feed and subreddit only get the remainder
+    reddit_articles = int(scale * REDDIT_SHARE)
+    rss_articles = scale - reddit_articles
+    per_feed, per_sub = feed_server.items_per_feed, reddit_server.posts_per_sub
+    n_feeds = math.ceil(rss_articles / per_feed)
+    n_subs = math.ceil(reddit_articles / per_sub)
+    feed_server.item_counts = {i: min(per_feed, rss_articles - i * per_feed) for i in range(n_feeds)}
+    reddit_server.post_counts = {f"bench{i}": min(per_sub, reddit_articles - i * per_sub) for i in range(n_subs)}
+    feeds = [{'name': f"Bench {i}", 'url': feed_server.feed_url(i, 'atom' if i % 2 else 'rss'),
+              'category': 'AI前沿', 'weight': 1.0} for i in range(n_feeds)]
+    subs = [{'name': f"bench{i}", 'category': '运动科学', 'weight': 1.0} for i in range(n_subs)]
+
+    work_dir = tempfile.mkdtemp(prefix=f'bench-{scale}-')
+    timer = StageTimer(scale, trace_memory, args.verbose and not trace_memory)
+    try:
+        configure(work_dir, feeds, subs, ollama)
+        articles = timer.run('fetch_rss', lambda: RSSFetcher().fetch_all())
+        reddit_fetcher = BenchRedditFetcher(reddit_server.url)
+        articles += timer.run('fetch_reddit', reddit_fetcher.fetch_all)
+
+        timer.run('extract', lambda: ContentExtractor().extract_all(articles) or articles)
+
+        def filter_dedup():
+            matcher = KeywordMatcher()
+            relevant = []
+            for a in articles:
+                match = matcher.match(a['title'], a['content_text'])
+                if match['score'] >= Config.KEYWORD_MIN_SCORE:
+                    a['relevance'] = match['score']
+                    a['matched_keywords'] = match['terms']
+                    relevant.append(a)
+            return Deduplicator().dedup(relevant)
+        unique = timer.run('filter_dedup', filter_dedup)
+
+        store = ArticleStore()
+        timer.run('store_fetched', lambda: store.save_fetched(unique) or unique)
+        # Every article goes to the LLM, so the summarizer is measured at full scale
+        selected = timer.run('rank', lambda: Ranker().select(unique, max_articles=0))
+
+        summarizer = Summarizer()
+        processed = timer.run('summarize',
+                              lambda: [a for a in summarizer.process_articles(selected) if a])
+        if summarizer.cache:
+            summarizer.cache.close()
+
+        today = datetime.date.today()
+        timer.run('store_enriched', lambda: store.save_enriched(processed, today) or processed)
+        page_articles = store.articles_for_date(today)
+        store.close()
+
+        def html():
+            builder = html_builder.HtmlBuilder()
+            builder.copy_static_assets()
+            builder.build_daily_page(today, page_articles, force=True)
+            builder.build_index_page()
+            return page_articles
+        timer.run('html', html)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return timer.results
+
+def print_results(results):
+    print(f"\n{'scale':>7}  {'stage':<15}{'seconds':>10}{'items':>8}{'items/s':>11}{'peak MB':>10}")
+    for r in results:
+        peak = '-' if r['peak_mb'] is None else f"{r['peak_mb']:.1f}"
+        print(f"{r['scale']:>7}  {r['stage']:<15}{r['seconds']:>10.3f}{r['items']:>8}"
+              f"{r['items_per_second']:>11.1f}{peak:>10}")
+
+def compare(results, baseline_path, tolerance, min_seconds):
+    """Print stages slower than the baseline by more than tolerance. Returns the regression count."""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {(r['scale'], r['stage']): r for r in json.load(f)['results']}
+    regressions = 0
+    for r in results:
+        old = baseline.get((r['scale'], r['stage']))
+        # Very short stages are too noisy to compare
+        if not old or max(old['seconds'], r['seconds']) < min_seconds:
+            continue
+        change = (r['seconds'] - old['seconds']) / old['seconds'] if old['seconds'] else 0.0
+        if change > tolerance:
+            regressions += 1
+            print(f"REGRESSION {r['scale']:>6} {r['stage']:<15} {old['seconds']:.3f}s -> {r['seconds']:.3f}s "
+                  f"(+{change:.0%})")
+    print(f"{regressions} regression(s) against {baseline_path} (tolerance {tolerance:.0%})")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline pipeline benchmark with fake RSS, Reddit and Ollama")
+    parser.add_argument('--scales', default=','.join(map(str, DEFAULT_SCALES)),
+                        help="Comma-separated article counts")
+    parser.add_argument('--items-per-feed', type=int, default=10)
+    parser.add_argument('--words-per-item', type=int, default=120)
+    parser.add_argument('--feed-latency', type=float, default=0.0, help="Seconds before each feed response")
+    parser.add_argument('--reddit-latency', type=float, default=0.0, help="Seconds before each listing response")
+    parser.add_argument('--tokens-per-second', type=float, default=0,
+                        help="Fake Ollama generation speed per request (0 = unthrottled)")
+    parser.add_argument('--prompt-latency', type=float, default=0.0, help="Fake prompt evaluation seconds")
+    parser.add_argument('--llm-failure-rate', type=float, default=0.0, help="Share of LLM requests answered 500")
+    parser.add_argument('--no-memory', action='store_true', help="Skip the traced pass (no peak memory)")
+    parser.add_argument('--verbose', action='store_true', help="Show pipeline output")
+    parser.add_argument('--output', help="Write results as JSON")
+    parser.add_argument('--baseline', help="Earlier --output file to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed slowdown per stage (0.25 = 25%%)")
+    parser.add_argument('--min-seconds', type=float, default=0.05, help="Ignore stages faster than this")
+    args = parser.parse_args()
+
+    scales = [int(s) for s in args.scales.split(',') if s.strip()]
+    servers = (
+        FakeFeedServer(items_per_feed=args.items_per_feed, words_per_item=args.words_per_item,
+                       latency=args.feed_latency).start(),
+        FakeReddit(posts_per_sub=Config.REDDIT_POSTS_PER_SUB, latency=args.reddit_latency).start(),
+        FakeOllama(tokens_per_second=args.tokens_per_second, prompt_latency=args.prompt_latency,
+                   failure_rate=args.llm_failure_rate).start(),
+    )
+    results = []
+    try:
+        for scale in scales:
+            print(f"Running scale {scale}...")
+            timed = run_scale(scale, servers, args)
+            if not args.no_memory:
+                tracemalloc.start()
+                peaks = {r['stage']: r['peak_mb'] for r in run_scale(scale, servers, args, trace_memory=True)}
+                tracemalloc.stop()
+                for r in timed:
+                    r['peak_mb'] = peaks.get(r['stage'])
+            results.extend(timed)
+    finally:
+        for server in servers:
+            server.stop()
+
+    print_results(results)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+                       'settings': vars(args), 'results': results}, f, indent=2)
+        print(f"Results written to {args.output}")
+    if args.baseline and compare(results, args.baseline, args.tolerance, args.min_seconds):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
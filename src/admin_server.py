@@ -2,10 +2,10 @@ import http.server
 import socketserver
 import json
 import os
-import sys
-import subprocess
-import threading
-import time
+from urllib.parse import urlsplit
+from src.config import Config
+from src.job_manager import JobManager
+from src import metrics
 
 # Define pathes
 BASE_DIR = os.path.dirname(os.path.dirname(__file__)) # d:\anti\daily-report-site
@@ -13,10 +13,21 @@ SOURCES_PATH = os.path.join(BASE_DIR, 'sources.json')
 WEB_DIR = os.path.join(os.path.dirname(__file__), 'admin')
 
 PORT = 8081
+SSE_KEEPALIVE = 15   # Seconds between comment lines on an idle event stream
+
+# Shared by all request threads: at most one pipeline run at a time
+if Config.ADMIN_RUN_MODE == 'subprocess':
+    PIPELINE = None
+    JOBS = JobManager()
+else:
+    from src.pipeline_worker import PipelineWorker
+    PIPELINE = PipelineWorker()
+    JOBS = JobManager(runner=PIPELINE.run)
 
 class AdminHandler(http.server.SimpleHTTPRequestHandler):
     def do_GET(self):
-        if self.path == '/api/config':
+        route = urlsplit(self.path).path
+        if route == '/api/config':
             self.send_response(200)
             self.send_header('Content-type', 'application/json')
             self.end_headers()
@@ -26,6 +37,12 @@ class AdminHandler(http.server.SimpleHTTPRequestHandler):
                     self.wfile.write(data.encode('utf-8'))
             except FileNotFoundError:
                 self.wfile.write(b'{}')
+        elif route == '/metrics':
+            self._send_metrics()
+        elif route == '/api/jobs':
+            self._send_json(200, JOBS.list_jobs())
+        elif route.startswith('/api/jobs/'):
+            self._handle_job(route[len('/api/jobs/'):])
         elif self.path == '/':
             self.path = '/index.html'
             return http.server.SimpleHTTPRequestHandler.do_GET(self)
@@ -61,29 +78,75 @@ class AdminHandler(http.server.SimpleHTTPRequestHandler):
             self.send_error(500, str(e))
 
     def _handle_run_collection(self):
-        def run_script():
-            print("Starting data collection...")
-            try:
-                result = subprocess.run(
-                    [sys.executable, "-m", "src.main"],
-                    cwd=BASE_DIR,
-                    capture_output=True,
-                    text=True
-                )
-                print("Collection process finished.")
-                if result.stdout: print(f"STDOUT: {result.stdout[:200]}...")
-                if result.stderr: print(f"STDERR: {result.stderr[:200]}...")
-            except Exception as e:
-                print(f"Failed to run script: {e}")
-
-        # Start background thread
-        thread = threading.Thread(target=run_script)
-        thread.start()
+        # Single-flight: a request during a run is queued, further ones coalesce into it
+        job, outcome = JOBS.submit()
+        messages = {
+            'started': "Collection started in background",
+            'queued': "A collection is running; this one will start when it finishes",
+            'coalesced': "A collection is already queued; request merged into it",
+        }
+        self._send_json(202, {'status': outcome, 'message': messages[outcome], 'job': job.to_dict()})
+
+    def _handle_job(self, rest):
+        job_id, _, action = rest.partition('/')
+        job = JOBS.get(job_id)
+        if job is None:
+            self.send_error(404, "Job not found")
+        elif action == 'events':
+            self._stream_job_events(job)
+        elif not action:
+            # No waiting: a queued job has no events until it starts
+            events, _ = JOBS.events_since(job, 0, timeout=0)
+            data = job.to_dict()
+            data['log'] = [e['data'] for e in events if e['type'] == 'log']
+            self._send_json(200, data)
+        else:
+            self.send_error(404, "Endpoint not found")
+
+    def _stream_job_events(self, job):
+        """Server-Sent Events: log / stage / status events until the job has finished"""
+        last_id = self.headers.get('Last-Event-ID', '')
+        seq = int(last_id) + 1 if last_id.isdigit() else 0
 
         self.send_response(200)
+        self.send_header('Content-type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        try:
+            while True:
+                events, done = JOBS.events_since(job, seq, timeout=SSE_KEEPALIVE)
+                if not events and not done:
+                    self.wfile.write(b': keepalive\n\n')
+                for event in events:
+                    data = json.dumps(event['data'], ensure_ascii=False)
+                    self.wfile.write(f"id: {event['seq']}\nevent: {event['type']}\ndata: {data}\n\n".encode('utf-8'))
+                    seq = event['seq'] + 1
+                self.wfile.flush()
+                if done:
+                    break
+        except (BrokenPipeError, ConnectionResetError):
+            pass   # Browser went away; EventSource reconnects with Last-Event-ID
+
+    def _send_metrics(self):
+        """Prometheus text format: run report aggregates plus admin job state"""
+        jobs = JOBS.list_jobs()
+        text = metrics.prometheus_text()
+        text += ("# HELP daily_admin_job_running 1 while a pipeline job is running\n"
+                 "# TYPE daily_admin_job_running gauge\n"
+                 f"daily_admin_job_running {int(jobs['current'] is not None)}\n"
+                 "# HELP daily_admin_job_pending 1 while a pipeline job is queued\n"
+                 "# TYPE daily_admin_job_pending gauge\n"
+                 f"daily_admin_job_pending {int(jobs['pending'] is not None)}\n")
+        self.send_response(200)
+        self.send_header('Content-type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.end_headers()
+        self.wfile.write(text.encode('utf-8'))
+
+    def _send_json(self, code, data):
+        self.send_response(code)
         self.send_header('Content-type', 'application/json')
         self.end_headers()
-        self.wfile.write(b'{"status": "started", "message": "Collection started in background"}')
+        self.wfile.write(json.dumps(data, ensure_ascii=False).encode('utf-8'))
 
     def translate_path(self, path):
         path = path.split('?',1)[0]
@@ -117,8 +180,11 @@ if __name__ == "__main__":
     socketserver.TCPServer.allow_reuse_address = True
         
     print(f"Starting Admin Server at http://localhost:{PORT}")
+    if PIPELINE:
+        PIPELINE.warm_up()
     
-    with socketserver.TCPServer(("", PORT), AdminHandler) as httpd:
+    # One thread per request, so event streams don't block the rest of the API
+    with http.server.ThreadingHTTPServer(("", PORT), AdminHandler) as httpd:
         try:
             httpd.serve_forever()
         except KeyboardInterrupt:
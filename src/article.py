@@ -0,0 +1,139 @@
+import json
+import marshal
+import datetime
+
+# Set by the fetchers (score is the Reddit score until the LLM replaces it)
+FETCHED_FIELDS = ('title', 'summary', 'url', 'permalink', 'source', 'suggested_category', 'published_at',
+                  'type', 'score', 'num_comments')
+# Set on the way to the LLM: extraction, keyword filter, dedup, ranking
+PIPELINE_FIELDS = ('content_text', 'content_snippet', 'relevance', 'matched_keywords', 'duplicate_urls',
+                   'priority')
+# Set by Summarizer._apply_enrichment / _fallback_enrichment (besides score)
+ENRICHMENT_FIELDS = ('title_zh', 'summary_zh', 'summary_short', 'comment', 'tags', 'category', 'category_code',
+                     'importance', 'enriched')
+FIELDS = FETCHED_FIELDS + PIPELINE_FIELDS + ENRICHMENT_FIELDS
+_FIELD_SET = frozenset(FIELDS)
+
+PACK_VERSION = 1
+_MISSING = ...   # Unset field in packed rows (marshal can encode Ellipsis)
+
+class Article:
+    """
+    One article on its way through the pipeline. Slotted, so an instance
+    holds the fields above and nothing else: no per-instance dict and no
+    raw feed entry.
+
+    Articles still behave like the dicts they replace: article['title'],
+    article.get('relevance', 0), 'tags' in article. An unset field is
+    absent, like a missing key. Templates use plain attribute access.
+    """
+    __slots__ = FIELDS
+
+    def __init__(self, **fields):
+        for name, value in fields.items():
+            self[name] = value
+
+    def __getitem__(self, name):
+        if name in _FIELD_SET:
+            try:
+                return getattr(self, name)
+            except AttributeError:
+                pass
+        raise KeyError(name)
+
+    def __setitem__(self, name, value):
+        if name not in _FIELD_SET:
+            raise KeyError(name)
+        setattr(self, name, value)
+
+    def __contains__(self, name):
+        return name in _FIELD_SET and hasattr(self, name)
+
+    def get(self, name, default=None):
+        return getattr(self, name, default) if name in _FIELD_SET else default
+
+    def keys(self):
+        return [name for name in FIELDS if hasattr(self, name)]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __repr__(self):
+        return f"Article({self.get('title', '')!r}, {self.get('url', '')!r})"
+
+    # Pickled as one tuple of values (e.g. for rebuild_all's worker processes)
+    def __getstate__(self):
+        return self._row(FIELDS)
+
+    def __setstate__(self, row):
+        self._load_row(FIELDS, row)
+
+    def _row(self, fields):
+        return tuple(getattr(self, name, _MISSING) for name in fields)
+
+    def _load_row(self, fields, row):
+        for name, value in zip(fields, row):
+            if value is not _MISSING and name in _FIELD_SET:
+                setattr(self, name, value)
+
+    def to_dict(self, fields=None):
+        """JSON-ready dict of the set fields (published_at as ISO 8601)"""
+        data = {}
+        for name in fields or FIELDS:
+            value = getattr(self, name, _MISSING)
+            if value is _MISSING:
+                continue
+            if isinstance(value, datetime.datetime):
+                value = value.isoformat()
+            data[name] = value
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """Inverse of to_dict; unknown keys (e.g. from older data) are ignored"""
+        article = cls()
+        for name, value in data.items():
+            if name not in _FIELD_SET:
+                continue
+            if name == 'published_at' and isinstance(value, str):
+                value = datetime.datetime.fromisoformat(value)
+            setattr(article, name, value)
+        return article
+
+def as_article(article):
+    """An Article as is; a plain dict with article fields converted with from_dict"""
+    return article if isinstance(article, Article) else Article.from_dict(article)
+
+def dump_json(articles, fields=None):
+    """Articles (or plain dicts) as a compact JSON array of to_dict() objects"""
+    return json.dumps([as_article(a).to_dict(fields) for a in articles], ensure_ascii=False, separators=(',', ':'))
+
+def pack_articles(articles, fields=None):
+    """
+    Binary encoding, faster and smaller than JSON: marshal of
+    (version, field names, one tuple of values per article). Only for the
+    pipeline's own files, as marshal data must come from a trusted source.
+    """
+    fields = tuple(fields or FIELDS)
+    published = fields.index('published_at') if 'published_at' in fields else None
+    rows = []
+    for article in articles:
+        row = article._row(fields)
+        if published is not None and isinstance(row[published], datetime.datetime):
+            row = row[:published] + (row[published].isoformat(),) + row[published + 1:]
+        rows.append(row)
+    return marshal.dumps((PACK_VERSION, fields, rows))
+
+def unpack_articles(data):
+    version, fields, rows = marshal.loads(data)
+    if version != PACK_VERSION:
+        raise ValueError(f"Unsupported article pack version {version}")
+    published = fields.index('published_at') if 'published_at' in fields else None
+    articles = []
+    for row in rows:
+        article = Article()
+        article._load_row(fields, row)
+        if published is not None and isinstance(row[published], str):
+            article.published_at = datetime.datetime.fromisoformat(row[published])
+        articles.append(article)
+    return articles
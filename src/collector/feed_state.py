@@ -0,0 +1,115 @@
+import os
+import json
+import time
+import threading
+import datetime
+import statistics
+from src.config import Config
+
+# Number of entry IDs remembered per feed. Feeds only expose their latest
+# entries, so this just needs to comfortably exceed a feed's page size.
+MAX_SEEN_IDS = 200
+MAX_PUBLISHED_HISTORY = 50   # Entry publish times kept per feed to learn its cadence
+
+def poll_interval_hours(published, now):
+    """
+    Hours until a feed with these publish times (epoch seconds) is polled
+    again: FEED_POLL_FACTOR times the median gap between its posts, where a
+    silence longer than twice that gap stretches the gap, so a feed that
+    went quiet slows down gradually. Bounded by FEED_MIN/MAX_POLL_HOURS.
+    """
+    times = sorted(set(published))
+    if len(times) < 2:
+        return Config.FEED_DEFAULT_POLL_HOURS
+    gap = statistics.median(b - a for a, b in zip(times, times[1:]))
+    gap = max(gap, (now - times[-1]) / 2)
+    hours = gap * Config.FEED_POLL_FACTOR / 3600
+    return min(Config.FEED_MAX_POLL_HOURS, max(Config.FEED_MIN_POLL_HOURS, hours))
+
+class FeedStateStore:
+    """
+    Small on-disk store of per-feed HTTP validators and seen entry IDs.
+
+    Layout of feed_state.json:
+        {url: {"etag": str, "last_modified": str, "seen_ids": [id, ...], "checked_at": iso,
+               "published": [epoch, ...], "poll_hours": float, "next_due": iso}}
+
+    Publish times of the feed's entries are its update history; next_due
+    is the last check plus poll_interval_hours() of that history.
+
+    Updates are kept in memory until save() is called, so a run that crashes
+    half-way does not mark entries as seen that were never processed.
+    """
+    def __init__(self, path=None):
+        self.path = path or os.path.join(Config.DATA_DIR, 'feed_state.json')
+        self._lock = threading.Lock()
+        self._feeds = self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+                return data if isinstance(data, dict) else {}
+        except Exception as e:
+            print(f"Warning: Could not read feed state {self.path}: {e}")
+            return {}
+
+    def conditional_headers(self, url):
+        """Return If-None-Match / If-Modified-Since headers for a feed"""
+        with self._lock:
+            state = self._feeds.get(url, {})
+            headers = {}
+            if state.get('etag'):
+                headers['If-None-Match'] = state['etag']
+            if state.get('last_modified'):
+                headers['If-Modified-Since'] = state['last_modified']
+            return headers
+
+    def seen_ids(self, url):
+        with self._lock:
+            return set(self._feeds.get(url, {}).get('seen_ids', []))
+
+    def update(self, url, etag=None, last_modified=None, entry_ids=None, published=None):
+        """
+        Record validators, newly seen entry IDs and entry publish times
+        (epoch seconds) for a feed that was just checked, and schedule its
+        next poll.
+        """
+        now = time.time()
+        with self._lock:
+            state = self._feeds.setdefault(url, {})
+            if etag is not None:
+                state['etag'] = etag
+            if last_modified is not None:
+                state['last_modified'] = last_modified
+            if entry_ids:
+                # Newest first, without duplicates, capped
+                merged = list(dict.fromkeys(list(entry_ids) + state.get('seen_ids', [])))
+                state['seen_ids'] = merged[:MAX_SEEN_IDS]
+            if published:
+                # Ignore dates in the future (wrong time zones, scheduled posts)
+                times = {int(t) for t in published if t <= now + 3600} | set(state.get('published', []))
+                state['published'] = sorted(times)[-MAX_PUBLISHED_HISTORY:]
+            state['checked_at'] = datetime.datetime.fromtimestamp(now).isoformat(timespec='seconds')
+            hours = poll_interval_hours(state.get('published', []), now)
+            state['poll_hours'] = round(hours, 2)
+            state['next_due'] = datetime.datetime.fromtimestamp(now + hours * 3600).isoformat(timespec='seconds')
+
+    def is_due(self, url, now=None):
+        """Whether a feed should be polled now; feeds without a schedule always are"""
+        with self._lock:
+            next_due = self._feeds.get(url, {}).get('next_due')
+        if not next_due:
+            return True
+        return (now or datetime.datetime.now()) >= datetime.datetime.fromisoformat(next_due)
+
+    def save(self):
+        """Atomically persist the state file"""
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._feeds, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
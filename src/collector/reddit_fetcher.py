@@ -1,70 +1,241 @@
 import praw
+import prawcore
 import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from src.config import Config
+from src.article import Article
+from src import metrics
+
+# Errors worth retrying with backoff instead of giving up on a subreddit
+RETRYABLE_ERRORS = (prawcore.exceptions.TooManyRequests,
+                    prawcore.exceptions.ServerError,
+                    prawcore.exceptions.RequestException)
+
+class RateBudget:
+    """
+    Shares Reddit's x-ratelimit-* budget between worker threads.
+    Every PRAW instance tracks the headers of its own responses; since the
+    budget belongs to the OAuth client, the most recent report wins.
+    """
+    def __init__(self, reserve=2):
+        self.reserve = reserve
+        self.remaining = None
+        self.reset_timestamp = None
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until the window resets if the budget is (almost) used up"""
+        with self._lock:
+            if self.remaining is None or self.remaining > self.reserve or not self.reset_timestamp:
+                self.remaining = None if self.remaining is None else self.remaining - 1
+                return
+            sleep_seconds = self.reset_timestamp - time.time()
+            self.remaining = None
+        if sleep_seconds > 0:
+            print(f"  Reddit rate limit nearly exhausted, sleeping {sleep_seconds:.1f}s")
+            time.sleep(sleep_seconds)
+
+    def update(self, reddit):
+        limits = reddit.auth.limits
+        with self._lock:
+            if limits.get('remaining') is not None:
+                self.remaining = limits['remaining']
+                self.reset_timestamp = limits.get('reset_timestamp')
 
 class RedditFetcher:
     def __init__(self):
         self.reddit = None
+        self._local = threading.local()
+        self._owner = threading.get_ident()   # Thread that uses self.reddit
+        self.budget = RateBudget()
         if Config.REDDIT_CLIENT_ID and Config.REDDIT_CLIENT_SECRET:
             try:
-                self.reddit = praw.Reddit(
-                    client_id=Config.REDDIT_CLIENT_ID,
-                    client_secret=Config.REDDIT_CLIENT_SECRET,
-                    user_agent=Config.REDDIT_USER_AGENT
-                )
+                self.reddit = self._create_client()
             except Exception as e:
                 print(f"Error initializing Reddit client: {e}")
         else:
             print("Warning: Reddit credentials not found in environment variables. Reddit fetcher disabled.")
 
+    def _create_client(self):
+        return praw.Reddit(
+            client_id=Config.REDDIT_CLIENT_ID,
+            client_secret=Config.REDDIT_CLIENT_SECRET,
+            user_agent=Config.REDDIT_USER_AGENT
+        )
+
+    def _client(self):
+        """PRAW is not thread safe, so every other thread gets its own instance"""
+        if threading.get_ident() == self._owner:
+            return self.reddit
+        if getattr(self._local, 'reddit', None) is None:
+            self._local.reddit = self._create_client()
+        return self._local.reddit
+
     def fetch_all(self):
         """
         Fetch top posts from configured subreddits.
-        Returns a list of article dictionaries.
+        REDDIT_FETCH_MODE "multi" reads subreddits in combined a+b+c listings
+        and only fetches subreddits missing from them individually;
+        "parallel" fetches every subreddit through the worker pool.
+        Returns a list of Articles.
         """
-        if not self.reddit:
-            return []
+        results = {source['name'].lower(): articles for source, articles in self.iter_fetch()}
 
+        # Keep sources.json order
         all_articles = []
         for source in Config.REDDIT_SUBREDDITS:
-            subreddit_name = source['name']
-            suggested_category = source['category']
-            
-            print(f"Fetching Reddit: r/{subreddit_name} ...")
+            all_articles.extend(results.get(source['name'].lower(), []))
+        return all_articles
+
+    def iter_fetch(self):
+        """
+        Yields (source, articles) for every subreddit as soon as its posts are
+        in: per combined listing in "multi" mode, then in completion order
+        for subreddits fetched individually.
+        """
+        if not self.reddit:
+            return
+
+        sources = list(Config.REDDIT_SUBREDDITS)
+        start_time = time.time()
+        print(f"Fetching {len(sources)} subreddits (mode: {Config.REDDIT_FETCH_MODE})...")
+
+        total = 0
+        pending = sources
+        if Config.REDDIT_FETCH_MODE == 'multi':
+            pending = []
+            chunk_size = max(1, Config.REDDIT_MULTI_CHUNK_SIZE)
+            for i in range(0, len(sources), chunk_size):
+                chunk = sources[i:i + chunk_size]
+                chunk_results = self._fetch_multi(chunk)
+                for source in chunk:
+                    articles = chunk_results.get(source['name'].lower())
+                    if articles:
+                        total += len(articles)
+                        yield source, articles
+                    else:
+                        # Drowned out by busier subreddits in the combined listing
+                        pending.append(source)
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=max(1, min(Config.REDDIT_MAX_WORKERS, len(pending)))) as executor:
+                futures = {executor.submit(self._fetch_subreddit, source): source for source in pending}
+                try:
+                    for future in as_completed(futures):
+                        articles = future.result()
+                        total += len(articles)
+                        yield futures[future], articles
+                finally:
+                    # Consumer stopped early (a later stage failed): drop downloads not started yet
+                    for future in futures:
+                        future.cancel()
+
+        print(f"Total Reddit articles fetched: {total} in {time.time() - start_time:.2f}s")
+
+    def _fetch_multi(self, sources):
+        """
+        Fetch several subreddits with one combined listing.
+        Returns {subreddit_name_lower: [articles]}, each capped at REDDIT_POSTS_PER_SUB.
+        """
+        by_name = {s['name'].lower(): s for s in sources}
+        combined = '+'.join(s['name'] for s in sources)
+        per_sub = Config.REDDIT_POSTS_PER_SUB
+        print(f"Fetching Reddit: r/{combined} ...")
+
+        results = {}
+        try:
+            # Over-fetch so that quieter subreddits still get a share of the listing
+            submissions = self._call_with_backoff(
+                lambda reddit: list(reddit.subreddit(combined).hot(limit=per_sub * len(sources) * 2)),
+                f"r/{combined}")
+        except Exception as e:
+            print(f"Error fetching r/{combined}: {e}")
+            return results
+
+        for submission in submissions:
+            if submission.stickied:
+                continue
+            name = submission.subreddit.display_name.lower()
+            source = by_name.get(name)
+            if not source or len(results.get(name, [])) >= per_sub:
+                continue
+            article = self._normalize_submission(submission, source['name'], source['category'])
+            if article:
+                results.setdefault(name, []).append(article)
+        return results
+
+    def _fetch_subreddit(self, source):
+        """Fetch a single subreddit. Never raises; returns a list of articles."""
+        subreddit_name = source['name']
+        suggested_category = source['category']
+
+        print(f"Fetching Reddit: r/{subreddit_name} ...")
+        articles = []
+        try:
+            submissions = self._call_with_backoff(
+                lambda reddit: list(reddit.subreddit(subreddit_name).hot(limit=Config.REDDIT_POSTS_PER_SUB)),
+                f"r/{subreddit_name}")
+            for submission in submissions:
+                if submission.stickied:
+                    continue
+
+                article = self._normalize_submission(submission, subreddit_name, suggested_category)
+                if article:
+                    articles.append(article)
+
+        except Exception as e:
+            print(f"Error fetching r/{subreddit_name}: {e}")
+        return articles
+
+    def _call_with_backoff(self, request, label):
+        """
+        Run request(reddit) within the shared rate budget, retrying throttled or
+        transient failures with exponential backoff (honouring Retry-After).
+        """
+        delay = Config.REDDIT_BACKOFF_BASE
+        start_time = time.time()
+        for attempt in range(Config.REDDIT_MAX_RETRIES + 1):
+            reddit = self._client()
+            self.budget.wait()
             try:
-                subreddit = self.reddit.subreddit(subreddit_name)
-                # Fetch hot posts, limit to 10
-                for submission in subreddit.hot(limit=10):
-                    if submission.stickied:
-                        continue
-                        
-                    article = self._normalize_submission(submission, subreddit_name, suggested_category)
-                    if article:
-                        all_articles.append(article)
-                        
+                result = request(reddit)
+                self.budget.update(reddit)
+                metrics.current().record_reddit_request(label, time.time() - start_time, items=len(result),
+                                                        retries=attempt)
+                return result
             except Exception as e:
-                print(f"Error fetching r/{subreddit_name}: {e}")
-                
-        print(f"Total Reddit articles fetched: {len(all_articles)}")
-        return all_articles
+                if attempt == Config.REDDIT_MAX_RETRIES or not isinstance(e, RETRYABLE_ERRORS):
+                    metrics.current().record_reddit_request(label, time.time() - start_time, retries=attempt,
+                                                            error=e.__class__.__name__)
+                    raise
+                wait = delay
+                response = getattr(e, 'response', None)
+                retry_after = response.headers.get('retry-after') if response is not None else None
+                if retry_after and retry_after.isdigit():
+                    wait = max(wait, int(retry_after))
+                print(f"  Reddit {label}: {e.__class__.__name__}, retrying in {wait:.0f}s")
+                time.sleep(wait)
+                delay *= 2
 
     def _normalize_submission(self, submission, subreddit_name, suggested_category):
         try:
             content = submission.selftext
             published_dt = datetime.datetime.fromtimestamp(submission.created_utc)
 
-            return {
-                'title': submission.title,
-                'summary': content, 
-                'url': submission.url,
-                'source': f"r/{subreddit_name}",
-                'suggested_category': suggested_category,
-                'published_at': published_dt,
-                'type': 'reddit',
-                'score': submission.score,
-                'num_comments': submission.num_comments,
-                'raw': {'id': submission.id, 'score': submission.score}
-            }
+            return Article(
+                title=submission.title,
+                summary=content,
+                url=submission.url,
+                permalink=f"https://www.reddit.com{submission.permalink}",
+                source=f"r/{subreddit_name}",
+                suggested_category=suggested_category,
+                published_at=published_dt,
+                type='reddit',
+                score=submission.score,
+                num_comments=submission.num_comments,
+            )
         except Exception as e:
             print(f"Error normalizing submission: {e}")
             return None
@@ -1,63 +1,216 @@
 import feedparser
 import datetime
+import calendar
 import time
-from email.utils import parsedate_to_datetime
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+import requests
 from src.config import Config
+from src.collector.feed_state import FeedStateStore
+from src.article import Article
+from src import metrics
 
-import socket
+USER_AGENT = "AI-Sports-Daily/1.0"
+
+class FetchDeadlineExceeded(Exception):
+    pass
 
 class RSSFetcher:
-    def fetch_all(self):
+    def __init__(self, max_workers=None, per_host_limit=None, timeout=None, deadline=None, state=None):
+        self.max_workers = max_workers or Config.RSS_MAX_WORKERS
+        self.per_host_limit = per_host_limit or Config.RSS_PER_HOST_LIMIT
+        self.timeout = timeout or Config.RSS_REQUEST_TIMEOUT
+        self.deadline = deadline or Config.RSS_REQUEST_DEADLINE
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = USER_AGENT
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._host_locks = defaultdict(lambda: threading.BoundedSemaphore(self.per_host_limit))
+        self._host_locks_guard = threading.Lock()
+        # Conditional GET / seen-entry state; None disables both
+        if state is None and Config.RSS_CONDITIONAL_GET:
+            state = FeedStateStore()
+        self.state = state
+
+    def select_feeds(self, due_only=False):
+        """
+        Configured feeds; with due_only (incremental runs) only those whose
+        next poll is due according to their publish cadence (see FeedStateStore).
+        """
+        feeds = list(Config.RSS_FEEDS)
+        if not due_only:
+            return feeds
+        if not self.state:
+            print("Feed state disabled (RSS_CONDITIONAL_GET=0), fetching every feed")
+            return feeds
+        now = datetime.datetime.now()
+        due = [f for f in feeds if self.state.is_due(f['url'], now)]
+        print(f"Incremental run: {len(due)}/{len(feeds)} feeds due")
+        return due
+
+    def fetch_all(self, feeds=None):
         """
-        Fetch articles from all configured RSS feeds.
-        Returns a list of article dictionaries.
+        Fetch articles from the given feeds (default: all configured RSS feeds).
+        Feeds are downloaded concurrently (bounded by RSS_MAX_WORKERS overall and
+        RSS_PER_HOST_LIMIT per host); results keep the order of sources.json.
+        Returns a list of Articles.
         """
-        # Set global socket timeout to prevent hangs
-        socket.setdefaulttimeout(30)
-        
+        feeds = list(Config.RSS_FEEDS) if feeds is None else feeds
+        print(f"Starting RSS fetch for {len(feeds)} feeds ({self.max_workers} workers, {self.per_host_limit} per host)...")
+        start_time = time.time()
+
         all_articles = []
-        print(f"Starting RSS fetch for {len(Config.RSS_FEEDS)} feeds...")
-        
-        for source in Config.RSS_FEEDS:
-            url = source['url']
-            suggested_category = source['category']
-            
-            print(f"Fetching RSS: {url} ...")
-            start_time = time.time()
-            try:
-                # Use a custom User-Agent to avoid being blocked
-                feed = feedparser.parse(url, agent="AI-Sports-Daily/1.0")
-                
-                # Check for bozo error (encoding/XML issues)
-                if feed.bozo:
-                    print(f"  Warning: Potential issue with feed {url}: {feed.bozo_exception}")
-
-                if not feed.entries:
-                    print(f"  No entries found in {url}")
-                    continue
+        if feeds:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(feeds))) as executor:
+                for articles in executor.map(self.fetch_feed, feeds):
+                    all_articles.extend(articles)
 
-                source_name = source['name'] if source['name'] != 'Unknown' else feed.feed.get('title', 'Unknown RSS')
-                elapsed = time.time() - start_time
-                print(f"  Success: {len(feed.entries)} entries in {elapsed:.2f}s")
-                
-                # Limit to latest 10 entries per feed to avoid overwhelming
-                entries_to_process = feed.entries[:10]
-                
-                for entry in entries_to_process:
-                    article = self._normalize_entry(entry, source_name, suggested_category)
-                    if article:
-                        all_articles.append(article)
-                        
-            except socket.timeout:
-                print(f"  Error: Timeout fetching {url}")
-            except Exception as e:
-                print(f"  Error fetching {url}: {e}")
-                
-        print(f"Total RSS articles fetched: {len(all_articles)}")
+        print(f"Total RSS articles fetched: {len(all_articles)} in {time.time() - start_time:.2f}s")
         return all_articles
 
+    def iter_fetch(self, feeds=None):
+        """
+        Like fetch_all, but yields (source, articles) for every feed as soon as
+        it has been downloaded, in completion order, so that later stages can
+        start before the slowest feed is in (see src/streaming.py).
+        """
+        feeds = list(Config.RSS_FEEDS) if feeds is None else feeds
+        print(f"Starting RSS fetch for {len(feeds)} feeds ({self.max_workers} workers, {self.per_host_limit} per host)...")
+        start_time = time.time()
+
+        total = 0
+        if feeds:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(feeds))) as executor:
+                futures = {executor.submit(self.fetch_feed, feed): feed for feed in feeds}
+                try:
+                    for future in as_completed(futures):
+                        articles = future.result()
+                        total += len(articles)
+                        yield futures[future], articles
+                finally:
+                    # Consumer stopped early (a later stage failed): drop downloads not started yet
+                    for future in futures:
+                        future.cancel()
+
+        print(f"Total RSS articles fetched: {total} in {time.time() - start_time:.2f}s")
+
+    def fetch_feed(self, source):
+        """Fetch and normalize a single feed. Never raises; returns a list of articles."""
+        url = source['url']
+        suggested_category = source['category']
+        label = source['name'] if source['name'] != 'Unknown' else url
+        run = metrics.current()
+
+        start_time = time.time()
+        body = b''
+        try:
+            request_headers = self.state.conditional_headers(url) if self.state else {}
+            with self._host_slot(url):
+                status, body, headers = self._download(url, request_headers)
+
+            if status == 304:
+                if self.state:
+                    self.state.update(url)
+                print(f"  Not modified: {url} ({time.time() - start_time:.2f}s)")
+                run.record_feed(label, url, time.time() - start_time, 'not_modified')
+                return []
+
+            # Hand the headers to feedparser so it can honour the declared charset
+            feed = feedparser.parse(body, response_headers=headers)
+
+            # Check for bozo error (encoding/XML issues)
+            if feed.bozo:
+                print(f"  Warning: Potential issue with feed {url}: {feed.bozo_exception}")
+
+            if not feed.entries:
+                print(f"  No entries found in {url}")
+                if self.state:
+                    self.state.update(url, etag=headers.get('etag'), last_modified=headers.get('last-modified'))
+                run.record_feed(label, url, time.time() - start_time, 'empty', size=len(body))
+                return []
+
+            source_name = source['name'] if source['name'] != 'Unknown' else feed.feed.get('title', 'Unknown RSS')
+            elapsed = time.time() - start_time
+            print(f"  Success: {url} - {len(feed.entries)} entries in {elapsed:.2f}s")
+
+            # Limit to latest 10 entries per feed to avoid overwhelming
+            entries_to_process = feed.entries[:10]
+
+            # Publish times of every listed entry make up the feed's update history
+            published = [calendar.timegm(t) for t in
+                         (e.get('published_parsed') or e.get('updated_parsed') for e in feed.entries) if t]
+
+            # Skip entries already handed to the pipeline in an earlier run
+            seen_ids = self.state.seen_ids(url) if self.state else set()
+            new_ids = []
+            articles = []
+            for entry in entries_to_process:
+                entry_id = self._entry_id(entry)
+                if entry_id in seen_ids:
+                    continue
+                new_ids.append(entry_id)
+                article = self._normalize_entry(entry, source_name, suggested_category)
+                if article:
+                    articles.append(article)
+
+            if self.state:
+                self.state.update(url, etag=headers.get('etag'), last_modified=headers.get('last-modified'),
+                                  entry_ids=new_ids, published=published)
+                if len(new_ids) < len(entries_to_process):
+                    print(f"  Skipped {len(entries_to_process) - len(new_ids)} already seen entries in {url}")
+            run.record_feed(label, url, time.time() - start_time, 'ok', size=len(body),
+                            entries=len(feed.entries), new_entries=len(articles))
+            return articles
+
+        except (requests.exceptions.Timeout, FetchDeadlineExceeded):
+            print(f"  Error: Timeout fetching {url} after {time.time() - start_time:.2f}s")
+            run.record_feed(label, url, time.time() - start_time, 'timeout', size=len(body))
+        except Exception as e:
+            print(f"  Error fetching {url}: {e}")
+            run.record_feed(label, url, time.time() - start_time, 'error', size=len(body))
+        return []
+
+    def _host_slot(self, url):
+        """Semaphore limiting concurrent requests to the same host"""
+        host = urlparse(url).netloc.lower()
+        with self._host_locks_guard:
+            return self._host_locks[host]
+
+    def save_state(self):
+        """Persist feed validators and seen entries (call once the run succeeded)"""
+        if self.state:
+            self.state.save()
+
+    def _entry_id(self, entry):
+        """Stable identifier for a feed entry (guid, then link, then title)"""
+        return entry.get('id') or entry.get('link') or entry.get('title', '')
+
+    def _download(self, url, request_headers=None):
+        """
+        GET a feed body, enforcing both a per-operation socket timeout and an
+        overall deadline for the whole transfer.
+        Returns (status_code, body, lowercased response headers).
+        """
+        deadline = time.time() + self.deadline
+        with self.session.get(url, headers=request_headers, timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            if response.status_code == 304:
+                return 304, b'', {}
+            chunks = []
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                if time.time() > deadline:
+                    raise FetchDeadlineExceeded(url)
+                chunks.append(chunk)
+            headers = {k.lower(): v for k, v in response.headers.items()}
+            # Lets feedparser resolve relative links against the final URL
+            headers.setdefault('content-location', response.url)
+            return response.status_code, b''.join(chunks), headers
+
     def _normalize_entry(self, entry, source_name, suggested_category):
-        """Convert feedparser entry to standard article dict"""
+        """Convert feedparser entry to an Article (the entry itself is not kept)"""
         try:
             title = entry.get('title', '').strip()
             if not title:
@@ -81,16 +234,15 @@ class RSSFetcher:
             else:
                 published_dt = datetime.datetime.now()
 
-            return {
-                'title': title,
-                'summary': content, # This is often HTML
-                'url': link,
-                'source': source_name,
-                'suggested_category': suggested_category, # Pass config category to summarize
-                'published_at': published_dt,
-                'type': 'rss',
-                'raw': entry # Keep raw just in case
-            }
+            return Article(
+                title=title,
+                summary=content, # This is often HTML
+                url=link,
+                source=source_name,
+                suggested_category=suggested_category, # Pass config category to summarize
+                published_at=published_dt,
+                type='rss',
+            )
         except Exception as e:
             print(f"Error normalizing entry: {e}")
             return None
@@ -19,9 +19,85 @@ class Config:
     OLLAMA_MODEL = "mistral"
     # Use environment variable for Ollama URL or default
     OLLAMA_API_URL = os.environ.get("OLLAMA_API_URL", "http://localhost:11434/api/generate")
+    OLLAMA_OPTIONS = {
+        "temperature": 0.3,  # Low temperature for more deterministic output
+        "num_ctx": 4096      # Context window
+    }
+    
+    # Streaming: stop once a complete JSON value arrived; time out on stalls, not total duration
+    LLM_STREAM = os.environ.get("LLM_STREAM", "1") != "0"
+    LLM_CONNECT_TIMEOUT = 10
+    LLM_FIRST_TOKEN_TIMEOUT = 180  # Prompt evaluation on CPU can be slow
+    LLM_STALL_TIMEOUT = 30         # Max gap between streamed tokens
+    
+    # Concurrent LLM requests; keep in line with the server's OLLAMA_NUM_PARALLEL
+    LLM_MAX_IN_FLIGHT = int(os.environ.get("LLM_MAX_IN_FLIGHT", os.environ.get("OLLAMA_NUM_PARALLEL", "4")))
+    
+    # Article content sent to the LLM is clean text truncated to this many (estimated) tokens,
+    # or less if num_ctx does not leave room for it
+    LLM_SNIPPET_MAX_TOKENS = int(os.environ.get("LLM_SNIPPET_MAX_TOKENS", "800"))
+    
+    # Multi-article prompts: up to LLM_BATCH_SIZE short articles per request (1 disables)
+    LLM_BATCH_SIZE = int(os.environ.get("LLM_BATCH_SIZE", "4"))
+    LLM_BATCH_MAX_ITEM_TOKENS = 600  # Longer articles are always sent on their own
+    
+    # LLM result cache (content-addressed, LRU eviction)
+    LLM_CACHE_ENABLED = os.environ.get("LLM_CACHE_ENABLED", "1") != "0"
+    LLM_CACHE_MAX_ENTRIES = 5000
+    LLM_CACHE_MAX_BYTES = 50 * 1024 * 1024
+    
+    # RSS Fetch Settings
+    RSS_MAX_WORKERS = int(os.environ.get("RSS_MAX_WORKERS", "8"))        # Total concurrent feed downloads
+    RSS_PER_HOST_LIMIT = int(os.environ.get("RSS_PER_HOST_LIMIT", "2"))  # Concurrent downloads per host (e.g. reddit.com)
+    RSS_REQUEST_TIMEOUT = float(os.environ.get("RSS_REQUEST_TIMEOUT", "15"))    # Connect/read timeout per socket operation
+    RSS_REQUEST_DEADLINE = float(os.environ.get("RSS_REQUEST_DEADLINE", "30"))  # Hard limit for a whole feed download
+    RSS_CONDITIONAL_GET = os.environ.get("RSS_CONDITIONAL_GET", "1") != "0"     # Send ETag/Last-Modified, skip seen entries
+    
+    # Adaptive polling: "--incremental" runs only fetch feeds whose next poll is due. A feed is
+    # polled FEED_POLL_FACTOR times its median gap between posts, within the min/max bounds
+    FEED_POLL_FACTOR = float(os.environ.get("FEED_POLL_FACTOR", "0.5"))
+    FEED_MIN_POLL_HOURS = float(os.environ.get("FEED_MIN_POLL_HOURS", "1"))
+    FEED_MAX_POLL_HOURS = float(os.environ.get("FEED_MAX_POLL_HOURS", "72"))
+    FEED_DEFAULT_POLL_HOURS = 24   # Until a feed has publish history
+    
+    # Reddit Fetch Settings
+    REDDIT_FETCH_MODE = os.environ.get("REDDIT_FETCH_MODE", "multi")  # "multi" (combined a+b listings) or "parallel"
+    REDDIT_POSTS_PER_SUB = 10
+    REDDIT_MULTI_CHUNK_SIZE = 20   # Subreddits per combined listing
+    REDDIT_MAX_WORKERS = int(os.environ.get("REDDIT_MAX_WORKERS", "4"))
+    REDDIT_MAX_RETRIES = 3
+    REDDIT_BACKOFF_BASE = 2.0      # Seconds, doubled after every retry
+    
+    # Filter Settings
+    KEYWORD_MIN_SCORE = float(os.environ.get("KEYWORD_MIN_SCORE", "1"))  # 1 = any body match, 3 = any title match
+    DEDUP_SIMHASH_DISTANCE = 3  # Max differing bits (of 64) for near-duplicate title/content; -1 disables
+    
+    # LLM Budget: ranked candidates are selected until one of these is reached (0 = no limit)
+    LLM_BUDGET_ARTICLES = int(os.environ.get("LLM_BUDGET_ARTICLES", "15"))
+    LLM_BUDGET_TOKENS = int(os.environ.get("LLM_BUDGET_TOKENS", "0"))      # Estimated prompt + completion tokens
+    LLM_BUDGET_SECONDS = int(os.environ.get("LLM_BUDGET_SECONDS", "0"))    # Wall-clock deadline for the LLM step
+    RANK_RECENCY_HALF_LIFE_HOURS = 24
+    # Unenriched candidates (over budget, past the deadline, LLM failed) are ranked again in later runs for this long
+    PENDING_MAX_AGE_HOURS = int(os.environ.get("PENDING_MAX_AGE_HOURS", "72"))
+    
+    # "streaming" overlaps fetching, filtering and LLM work (src/streaming.py);
+    # "phased" runs each step over all articles before starting the next
+    PIPELINE_MODE = os.environ.get("PIPELINE_MODE", "streaming")
+    PIPELINE_QUEUE_SIZE = 32   # Fetched feeds buffered ahead of the filter stage; fetchers wait when full
     
     # Output Settings
-    MAX_HISTORY_DAYS = 30
+    MAX_HISTORY_DAYS = 30   # Full daily pages kept; older days are compacted into monthly archives
+    SITE_BUILD_WORKERS = int(os.environ.get("SITE_BUILD_WORKERS", "0"))   # Full rebuild processes, 0 = one per CPU
+    
+    # Persistent state between runs (feed validators, caches, ...)
+    DATA_DIR = os.environ.get("DATA_DIR", os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data'))
+    ARTICLE_DB_PATH = os.path.join(DATA_DIR, 'articles.db')
+    LLM_CACHE_PATH = os.path.join(DATA_DIR, 'llm_cache.db')
+    JINJA_CACHE_DIR = os.path.join(DATA_DIR, 'jinja_cache')   # Compiled template bytecode
+    
+    # Admin server runs: "warm" keeps the pipeline loaded in the server process,
+    # "subprocess" starts a fresh python -m src.main for every run
+    ADMIN_RUN_MODE = os.environ.get("ADMIN_RUN_MODE", "warm")
     
     # Dynamic Settings (Loaded from JSON)
     RSS_FEEDS = []          # List of dicts: {name, url, category}
@@ -58,10 +134,11 @@ class Config:
                 cls.RSS_FEEDS.append({
                     'name': item.get('name', 'Unknown'),
                     'url': item.get('url'),
-                    'category': item.get('category', 'AI前沿')
+                    'category': item.get('category', 'AI前沿'),
+                    'weight': cls._weight(item)
                 })
             elif isinstance(item, str) and item.strip():
-                cls.RSS_FEEDS.append({'name': 'Unknown', 'url': item.strip(), 'category': 'AI前沿'})
+                cls.RSS_FEEDS.append({'name': 'Unknown', 'url': item.strip(), 'category': 'AI前沿', 'weight': 1.0})
 
         # Store complete Subreddits
         cls.REDDIT_SUBREDDITS = []
@@ -69,16 +146,26 @@ class Config:
             if isinstance(item, dict) and item.get('name'):
                 cls.REDDIT_SUBREDDITS.append({
                     'name': item.get('name'),
-                    'category': item.get('category', 'AI前沿')
+                    'category': item.get('category', 'AI前沿'),
+                    'weight': cls._weight(item)
                 })
             elif isinstance(item, str) and item.strip():
-                cls.REDDIT_SUBREDDITS.append({'name': item.strip(), 'category': 'AI前沿'})
+                cls.REDDIT_SUBREDDITS.append({'name': item.strip(), 'category': 'AI前沿', 'weight': 1.0})
                 
         # Parse Keywords
         cls.KEYWORDS = [k for k in data.get('keywords', []) if isinstance(k, str)]
         
         logger.info(f"Loaded {len(cls.RSS_FEEDS)} RSS feeds, {len(cls.REDDIT_SUBREDDITS)} Subreddits.")
 
+    @staticmethod
+    def _weight(item):
+        """Source weight from a sources.json entry; 1.0 when missing or invalid"""
+        try:
+            return float(item.get('weight', 1.0))
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid weight {item.get('weight')!r} for source {item.get('name') or item.get('url')}, using 1.0")
+            return 1.0
+
     @classmethod
     def reload(cls):
         """Reload configuration"""
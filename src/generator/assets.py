@@ -0,0 +1,170 @@
+import os
+import re
+import gzip
+import json
+import hashlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ASSET_MANIFEST_NAME = 'assets.json'
+FINGERPRINT_LENGTH = 10
+COMPRESSIBLE_EXTS = ('.css', '.js', '.svg', '.json', '.html')
+
+_CSS_TOKEN_RE = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/', re.DOTALL)
+
+def minify_css(source):
+    """Strip comments and redundant whitespace; string literals are left alone"""
+    out = []
+    pending = []   # Code between string literals, comments removed
+    pos = 0
+    for m in _CSS_TOKEN_RE.finditer(source):
+        pending.append(source[pos:m.start()])
+        if m.group(1):
+            out.append(_squeeze_css(' '.join(pending)))
+            out.append(m.group(1))
+            pending = []
+        pos = m.end()
+    pending.append(source[pos:])
+    out.append(_squeeze_css(' '.join(pending)))
+    return ''.join(out).replace(';}', '}').strip()
+
+def _squeeze_css(text):
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'\s*([{};,>])\s*', r'\1', text)
+    return re.sub(r':\s+', ':', text)
+
+# Characters after which a '/' starts a regex literal rather than a division
+_JS_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^') | {''}
+
+def minify_js(source):
+    """
+    Conservative JS minifier: removes comments, indentation and blank lines
+    but keeps line breaks, so automatic semicolon insertion is unaffected.
+    Strings, template literals and regex literals are copied verbatim.
+    """
+    out = []
+    i = 0
+    n = len(source)
+    last_significant = ''
+    while i < n:
+        ch = source[i]
+        nxt = source[i + 1] if i + 1 < n else ''
+        if ch == '/' and nxt == '/':
+            while i < n and source[i] != '\n':
+                i += 1
+            continue
+        if ch == '/' and nxt == '*':
+            end = source.find('*/', i + 2)
+            i = n if end == -1 else end + 2
+            out.append(' ')
+            continue
+        if ch in '"\'`' or (ch == '/' and last_significant in _JS_REGEX_PRECEDERS):
+            j = i + 1
+            in_class = False
+            while j < n:
+                c = source[j]
+                if c == '\\':
+                    j += 2
+                    continue
+                if ch == '/':
+                    if c == '[':
+                        in_class = True
+                    elif c == ']':
+                        in_class = False
+                    elif c == '/' and not in_class:
+                        break
+                    elif c == '\n':
+                        break
+                elif c == ch:
+                    break
+                j += 1
+            out.append(source[i:j + 1])
+            last_significant = ch
+            i = j + 1
+            continue
+        out.append(ch)
+        if not ch.isspace():
+            last_significant = ch
+        i += 1
+
+    lines = (line.strip() for line in ''.join(out).split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+class AssetPipeline:
+    """
+    Publishes static/ into output/static/: CSS and JS are minified and every
+    file is written under a content-fingerprinted name (style.<hash>.css)
+    with .gz (and .br, if the brotli module is installed) siblings.
+    output/static/assets.json maps source names to published names and
+    records source hashes, so unchanged sources are skipped. Earlier
+    fingerprinted files are kept because pages not rebuilt still link them.
+    """
+    def __init__(self, static_dir, output_static_dir):
+        self.static_dir = static_dir
+        self.output_static_dir = output_static_dir
+        self.manifest_path = os.path.join(output_static_dir, ASSET_MANIFEST_NAME)
+        self.manifest = self.load_manifest(output_static_dir)
+
+    @staticmethod
+    def load_manifest(output_static_dir):
+        path = os.path.join(output_static_dir, ASSET_MANIFEST_NAME)
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"Warning: Could not read asset manifest: {e}")
+        return {}
+
+    def build(self):
+        """Process every file in static/. Returns {source_name: published_name}."""
+        os.makedirs(self.output_static_dir, exist_ok=True)
+        built = 0
+        for name in sorted(os.listdir(self.static_dir)):
+            source_path = os.path.join(self.static_dir, name)
+            if not os.path.isfile(source_path):
+                continue
+            with open(source_path, 'rb') as f:
+                data = f.read()
+            source_hash = hashlib.sha256(data).hexdigest()
+
+            entry = self.manifest.get(name, {})
+            if entry.get('source_hash') == source_hash and \
+                    os.path.exists(os.path.join(self.output_static_dir, entry.get('file', ''))):
+                continue
+
+            base, ext = os.path.splitext(name)
+            minifier = MINIFIERS.get(ext.lower())
+            if minifier:
+                data = minifier(data.decode('utf-8')).encode('utf-8')
+            fingerprint = hashlib.sha256(data).hexdigest()[:FINGERPRINT_LENGTH]
+            published = f"{base}.{fingerprint}{ext}"
+            self._write(published, data)
+            self.manifest[name] = {'file': published, 'source_hash': source_hash}
+            built += 1
+
+        if built:
+            with open(self.manifest_path, 'w', encoding='utf-8') as f:
+                json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+        print(f"Static assets: {built} rebuilt, {len(self.manifest) - built} unchanged")
+        return self.mapping()
+
+    def mapping(self):
+        return {name: entry['file'] for name, entry in self.manifest.items()}
+
+    def _write(self, published, data):
+        path = os.path.join(self.output_static_dir, published)
+        with open(path, 'wb') as f:
+            f.write(data)
+        if not published.endswith(COMPRESSIBLE_EXTS):
+            return
+        with open(path + '.gz', 'wb') as f:
+            f.write(gzip.compress(data, compresslevel=9, mtime=0))
+        if brotli is not None:
+            with open(path + '.br', 'wb') as f:
+                f.write(brotli.compress(data, quality=11))
@@ -1,30 +1,162 @@
 import os
-import shutil
+import re
 import datetime
+import hashlib
 import json
-from jinja2 import Environment, FileSystemLoader
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
+from src.generator.assets import AssetPipeline
+from src.generator.search_index import SearchIndex, SEARCH_DIR_NAME
+from src.article import Article, as_article, dump_json, pack_articles, unpack_articles
+from src.config import Config
+from src import metrics
 
 # Configuration
 TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'template')
 OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'output')
 STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'static')
 MAX_ARTICLES_PER_PAGE = 30
+ARCHIVE_SHARD_SIZE = 20   # Hidden articles per lazily loaded archive-<n>.json
+MANIFEST_NAME = 'site-manifest.json'
+MONTHS_DIR_NAME = 'archive'   # output/archive/<YYYY-MM>/: days past MAX_HISTORY_DAYS, compacted per month
+
+# Article fields that end up in a daily page; only these feed the content hash
+PAGE_FIELDS = ('title', 'title_zh', 'summary', 'summary_zh', 'summary_short', 'url', 'source', 'category',
+               'category_code', 'importance', 'tags')
+# Fields filter.js needs to render a list item from an archive shard
+ARCHIVE_FIELDS = ('title', 'summary_short', 'url', 'source', 'category', 'category_code', 'importance', 'tags')
 
 def ensure_dir(path):
     if not os.path.exists(path):
         os.makedirs(path)
 
+def content_hash(data):
+    """Stable hash of JSON-like data (datetimes and other objects via str)"""
+    blob = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+def write_if_changed(path, content, mode='w'):
+    """Write a file only when its content differs. Returns True if written."""
+    data = content.encode('utf-8') if isinstance(content, str) else content
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    with open(path, 'wb') as f:
+        f.write(data)
+    return True
+
+class SiteManifest:
+    """
+    Persisted record of what has been built, stored next to the site in
+    output/site-manifest.json (the deploy workflow restores output/ from
+    gh-pages before each run):
+        {"pages": {"YYYY-MM-DD": {"count", "content_hash", "render_hash", "generated_time"}},
+         "months": {"YYYY-MM": {"days": {"YYYY-MM-DD": count}, "unlisted": {"YYYY-MM-DD": count},
+                                "count", "content_hash", "generated_time"}}}
+    Pages are the full daily pages within the retention window, months the
+    monthly archives older days were compacted into. Unlisted days were
+    compacted without their articles (pages built before the article store),
+    so the archive only knows how many there were.
+    """
+    def __init__(self, output_dir=None):
+        self.output_dir = output_dir or OUTPUT_DIR
+        self.path = os.path.join(self.output_dir, MANIFEST_NAME)
+        self.pages = {}
+        self.months = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.pages = data.get('pages', {})
+                self.months = data.get('months', {})
+            except Exception as e:
+                print(f"Warning: Could not read site manifest: {e}")
+        else:
+            self._discover()
+
+    def _discover(self):
+        """Seed the manifest from date folders built before it existed"""
+        if not os.path.exists(self.output_dir):
+            return
+        for item in os.listdir(self.output_dir):
+            page_path = os.path.join(self.output_dir, item, 'index.html')
+            if not os.path.isfile(page_path):
+                continue
+            try:
+                datetime.datetime.strptime(item, '%Y-%m-%d')
+            except ValueError:
+                continue
+            with open(page_path, 'r', encoding='utf-8') as f:
+                html = f.read()
+            m = re.search(r'还有 (?:<span class="archive-remaining">)?(\d+)', html)
+            count = html.count('<article class="list-item') + (int(m.group(1)) if m else 0)
+            self.pages[item] = {'count': count}
+
+    def history(self):
+        """[(date_obj, article_count)] for every built date page"""
+        return [(datetime.datetime.strptime(d, '%Y-%m-%d').date(), p.get('count', 0))
+                for d, p in self.pages.items()]
+
+    def month_history(self):
+        """[("YYYY-MM", article_count)] for every monthly archive"""
+        return [(m, entry.get('count', 0)) for m, entry in self.months.items()]
+
+    def save(self):
+        ensure_dir(self.output_dir)
+        data = json.dumps({'pages': dict(sorted(self.pages.items())), 'months': dict(sorted(self.months.items()))},
+                          ensure_ascii=False, indent=2)
+        write_if_changed(self.path, data)
+
 class HtmlBuilder:
     def __init__(self):
-        self.env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
+        # Compiled templates persist across runs and worker processes; Jinja
+        # checks each entry against the template source, so edits invalidate it
+        ensure_dir(Config.JINJA_CACHE_DIR)
+        self.env = Environment(loader=FileSystemLoader(TEMPLATE_DIR),
+                               bytecode_cache=FileSystemBytecodeCache(Config.JINJA_CACHE_DIR))
+        self.env.globals['asset'] = lambda name: self.assets.get(name, name)
+        self.search_index = SearchIndex(OUTPUT_DIR, os.path.join(Config.DATA_DIR, SEARCH_DIR_NAME))
+        self.refresh()
+
+    def refresh(self):
+        """
+        (Re)load everything that may change on disk between builds: asset
+        mapping, templates and the site manifest. A long-lived builder calls
+        this before each build; unchanged templates come from the Jinja cache.
+        """
+        # Fingerprinted static file names, e.g. asset('style.css') -> 'style.1a2b3c4d5e.css'
+        self.assets = AssetPipeline(STATIC_DIR, os.path.join(OUTPUT_DIR, 'static')).mapping()
         self.daily_template = self.env.get_template('daily_template.html')
         self.index_template = self.env.get_template('index_template.html')
+        self.month_template = self.env.get_template('month_template.html')
+        # Template sources are part of every page's inputs
+        self.template_hash = content_hash([self.env.loader.get_source(self.env, name)[0]
+                                           for name in ('daily_template.html', 'index_template.html')])
+        self.month_template_hash = content_hash(self.env.loader.get_source(self.env, 'month_template.html')[0])
+        self.manifest = SiteManifest()
 
-    def build_daily_page(self, date_obj, articles):
+    def build_daily_page(self, date_obj, articles, force=False):
         """
         Generate a daily report page.
         date_obj: datetime.date object
-        articles: list of dictionaries
+        articles: list of Articles (plain dicts work too)
+        The page is skipped when its inputs (articles, templates) match the
+        site manifest and the file is still on disk, unless force is set.
+        Returns True if the page was (re)written.
+        """
+        date_str = date_obj.strftime('%Y-%m-%d')
+        entry, written = self.render_daily_page(date_obj, articles, force)
+        self.record_daily_page(date_str, articles, entry)
+        self.manifest.save()
+        return written
+
+    def render_daily_page(self, date_obj, articles, force=False):
+        """
+        Write the page and archive shards of one date without touching shared
+        state (site manifest, search index), so dates can render in parallel.
+        Returns (manifest_entry, written); the entry is None if skipped.
         """
         date_str = date_obj.strftime('%Y-%m-%d')
         display_date = date_obj.strftime('%Y年%m月%d日')
@@ -32,6 +164,20 @@ class HtmlBuilder:
         # Prepare output directory
         daily_output_dir = os.path.join(OUTPUT_DIR, date_str)
         ensure_dir(daily_output_dir)
+        page_path = os.path.join(daily_output_dir, 'index.html')
+        
+        inputs_hash = content_hash({
+            'articles': [{k: a.get(k) for k in PAGE_FIELDS} for a in articles],
+            'templates': self.template_hash,
+            'assets': self.assets,
+            'max_per_page': MAX_ARTICLES_PER_PAGE,
+            'shard_size': ARCHIVE_SHARD_SIZE,
+        })
+        entry = self.manifest.pages.get(date_str, {})
+        if not force and entry.get('content_hash') == inputs_hash and os.path.exists(page_path):
+            print(f"Daily page for {date_str} unchanged, skipped")
+            metrics.current().count('pages_skipped')
+            return None, False
         
         # Sort by importance
         sorted_articles = sorted(articles, key=lambda x: x.get('importance', 0), reverse=True)
@@ -49,11 +195,12 @@ class HtmlBuilder:
             hidden_articles = sorted_articles[MAX_ARTICLES_PER_PAGE:]
             has_more = True
             
-            # Save hidden articles to archive.json
-            with open(os.path.join(daily_output_dir, 'archive.json'), 'w', encoding='utf-8') as f:
-                json.dump(hidden_articles, f, ensure_ascii=False, indent=2)
 
-        # Render HTML
+        # Hidden articles go to fixed-size JSON shards that filter.js loads on demand
+        shard_count = self._write_archive_shards(daily_output_dir, hidden_articles)
+        
+        # Render HTML (only happens when inputs changed, so the timestamp marks real updates)
+        generated_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         html_content = self.daily_template.render(
             title=f"AI运动日报 | {display_date}",
             date_str=display_date,
@@ -64,20 +211,58 @@ class HtmlBuilder:
             canonical_url=f"./{date_str}/index.html", # Relative for now, can be absolute if base URL known
             has_more=has_more,
             hidden_count=len(hidden_articles),
-            generated_time=datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            shard_count=shard_count,
+            generated_time=generated_time
         )
         
         # Write file
-        with open(os.path.join(daily_output_dir, 'index.html'), 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        written = write_if_changed(page_path, html_content)
+        entry = {
+            'count': len(articles),
+            'content_hash': inputs_hash,
+            'render_hash': content_hash(html_content),
+            'generated_time': generated_time,
+        }
             
         print(f"Generated daily page for {date_str} ({len(display_articles)} displayed, {len(hidden_articles)} archived)")
+        metrics.current().count('pages_rendered')
+        return entry, written
+
+    def record_daily_page(self, date_str, articles, entry):
+        """Update manifest (not saved) and search index after render_daily_page"""
+        if entry is not None:
+            self.manifest.pages[date_str] = entry
+            self.search_index.update_day(date_str, articles)
+        elif not self.search_index.has_day(date_str):
+            self.search_index.update_day(date_str, articles)
 
-    def build_index_page(self, existing_dates):
+    def _write_archive_shards(self, daily_output_dir, hidden_articles):
+        """
+        Write hidden articles as compact, field-trimmed archive-<n>.json shards
+        of ARCHIVE_SHARD_SIZE items and remove shards left over from a larger
+        earlier build. Returns the number of shards.
+        """
+        shards = [hidden_articles[i:i + ARCHIVE_SHARD_SIZE]
+                  for i in range(0, len(hidden_articles), ARCHIVE_SHARD_SIZE)]
+        for n, shard in enumerate(shards):
+            write_if_changed(os.path.join(daily_output_dir, f'archive-{n}.json'), dump_json(shard, ARCHIVE_FIELDS))
+
+        for item in os.listdir(daily_output_dir):
+            m = re.match(r'archive-(\d+)\.json$', item)
+            if (m and int(m.group(1)) >= len(shards)) or item == 'archive.json':
+                os.remove(os.path.join(daily_output_dir, item))
+        return len(shards)
+
+    def build_index_page(self, existing_dates=None):
         """
         Generate the main index/archive page.
-        existing_dates: list of (date_obj, article_count) tuples
+        existing_dates: list of (date_obj, article_count) tuples,
+        defaults to every page recorded in the site manifest.
+        Returns True if the page was (re)written.
         """
+        if existing_dates is None:
+            existing_dates = self.manifest.history()
+        
         # Calendar data (last 30 days)
         today = datetime.date.today()
         calendar_days = []
@@ -102,40 +287,247 @@ class HtmlBuilder:
                 'count': count
             })
             
+        # Monthly archives of compacted days (reverse chronological)
+        months = []
+        for month, count in sorted(self.manifest.month_history(), reverse=True):
+            year, month_number = month.split('-')
+            months.append({
+                'date_str': f"{year}年{month_number}月",
+                'link': f"./{MONTHS_DIR_NAME}/{month}/index.html",
+                'count': count
+            })
+            
         # Render HTML
         html_content = self.index_template.render(
             calendar_days=calendar_days,
-            archives=archives
+            archives=archives,
+            months=months
         )
         
         # Write file
-        with open(os.path.join(OUTPUT_DIR, 'index.html'), 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        written = write_if_changed(os.path.join(OUTPUT_DIR, 'index.html'), html_content)
         
-        print("Generated index page")
+        print("Generated index page" if written else "Index page unchanged")
+        return written
+
+    def retention_cutoff(self, today=None):
+        """Oldest date (YYYY-MM-DD) that keeps its full daily page"""
+        today = today or datetime.date.today()
+        return (today - datetime.timedelta(days=Config.MAX_HISTORY_DAYS)).strftime('%Y-%m-%d')
+
+    def compact_history(self, today=None):
+        """
+        Apply the retention window (MAX_HISTORY_DAYS): days older than it are
+        folded into their monthly archive and their daily pages and search
+        index entries removed. Expired days come from the article store
+        (data/, which outlives output/) as well as the manifest, so a day is
+        compacted even if its page was never built in this output directory.
+        A run only handles days not yet in an archive, so its cost does not
+        grow with the age of the site. Returns the number of days compacted.
+        """
+        cutoff = self.retention_cutoff(today)
+        for date_str in self.search_index.indexed_days():
+            if date_str < cutoff:
+                self.search_index.remove_day(date_str)
+
+        from src.storage.article_store import ArticleStore
+        store = ArticleStore()
+        days = {}
+        unlisted = {}
+        try:
+            stored = {d.strftime('%Y-%m-%d') for d in store.report_dates()}
+            # Days already in an archive whose data file is present
+            compacted = {d for month, entry in self.manifest.months.items()
+                         if os.path.exists(os.path.join(self._month_dir(month), 'articles.json'))
+                         for d in entry.get('days', {})}
+            expired = {d for d in stored if d < cutoff and d not in compacted}
+            expired |= {d for d in self.manifest.pages if d < cutoff}
+            for date_str in sorted(expired):
+                articles = store.articles_for_date(datetime.datetime.strptime(date_str, '%Y-%m-%d').date())
+                if not articles and self.manifest.pages.get(date_str, {}).get('count'):
+                    # Page built before the article store: the archive keeps its count only
+                    unlisted[date_str] = self.manifest.pages[date_str]['count']
+                    continue
+                days[date_str] = articles
+        finally:
+            store.close()
+        if not days and not unlisted:
+            return 0
+        self.compact_days(days, unlisted=unlisted)
+        self.manifest.save()
+        return len(days) + len(unlisted)
+
+    def compact_days(self, days, force=False, unlisted=None):
+        """
+        Merge {date_str: articles} into the monthly archives (data file and
+        page), then remove those days' full pages. unlisted: {date_str: count}
+        of days without stored articles, archived by count only. The manifest
+        is updated but not saved. Returns the set of months touched.
+        """
+        by_month = {}
+        for date_str, articles in days.items():
+            by_month.setdefault(date_str[:7], {})[date_str] = articles
+        unlisted_by_month = {}
+        for date_str, count in (unlisted or {}).items():
+            unlisted_by_month.setdefault(date_str[:7], {})[date_str] = count
+            by_month.setdefault(date_str[:7], {})
+
+        for month, month_days in sorted(by_month.items()):
+            data = self._load_month_data(month)
+            for date_str, articles in month_days.items():
+                ranked = sorted(articles, key=lambda a: a.get('importance', 0), reverse=True)
+                data[date_str] = [as_article(a) for a in ranked]
+            if month in unlisted_by_month:
+                self.manifest.months.setdefault(month, {}).setdefault('unlisted', {}).update(unlisted_by_month[month])
+            self.render_month_page(month, data, force)
+
+            month_days = {**month_days, **unlisted_by_month.get(month, {})}
+
+            for date_str in month_days:
+                self.manifest.pages.pop(date_str, None)
+                shutil.rmtree(os.path.join(OUTPUT_DIR, date_str), ignore_errors=True)
+                self.search_index.remove_day(date_str)
+            print(f"Compacted {len(month_days)} day(s) into the {month} archive")
+        return set(by_month)
+
+    def _month_dir(self, month):
+        return os.path.join(OUTPUT_DIR, MONTHS_DIR_NAME, month)
+
+    def _load_month_data(self, month):
+        """{date_str: [Article]} of a monthly archive (ARCHIVE_FIELDS only)"""
+        path = os.path.join(self._month_dir(month), 'articles.json')
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return {d: [Article.from_dict(a) for a in items] for d, items in json.load(f).items()}
+        except Exception as e:
+            print(f"Warning: Could not read monthly archive {path}: {e}")
+            return {}
+
+    def render_month_page(self, month, data, force=False):
+        """
+        Write a monthly archive: articles.json with the trimmed articles of
+        each compacted day (ARCHIVE_FIELDS) and index.html listing them.
+        The page is skipped when its inputs are unchanged. Returns True if written.
+        """
+        month_dir = self._month_dir(month)
+        ensure_dir(month_dir)
+        page_path = os.path.join(month_dir, 'index.html')
+        data = dict(sorted(data.items()))
+        blob = json.dumps({d: [a.to_dict(ARCHIVE_FIELDS) for a in items] for d, items in data.items()},
+                          ensure_ascii=False, separators=(',', ':'))
+        write_if_changed(os.path.join(month_dir, 'articles.json'), blob)
+
+        entry = self.manifest.months.get(month, {})
+        self.manifest.months[month] = entry
+        unlisted = {d: c for d, c in entry.get('unlisted', {}).items() if d not in data}
+        if unlisted:
+            entry['unlisted'] = unlisted
+        else:
+            entry.pop('unlisted', None)
+        inputs_hash = content_hash([blob, unlisted, self.month_template_hash, self.assets])
+        entry['days'] = dict(sorted({**unlisted, **{d: len(items) for d, items in data.items()}}.items()))
+        entry['count'] = sum(entry['days'].values())
+        if not force and entry.get('content_hash') == inputs_hash and os.path.exists(page_path):
+            print(f"Monthly archive {month} unchanged, skipped")
+            return False
+
+        year, month_number = month.split('-')
+        month_str = f"{year}年{month_number}月"
+        days = [{'date_str': datetime.datetime.strptime(d, '%Y-%m-%d').strftime('%m月%d日'),
+                 'count': count, 'articles': data.get(d, [])}
+                for d, count in sorted(entry['days'].items(), reverse=True)]
+        generated_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        html_content = self.month_template.render(
+            title=f"AI运动日报 | {month_str}",
+            month_str=month_str,
+            days=days,
+            total_count=entry['count'],
+            generated_time=generated_time
+        )
+        written = write_if_changed(page_path, html_content)
+        entry['content_hash'] = inputs_hash
+        entry['generated_time'] = generated_time
+        print(f"Generated monthly archive {month} ({entry['count']} articles, {len(days)} days)")
+        return written
 
     def copy_static_assets(self):
-        """Copy static CSS/JS to output directory"""
+        """Publish minified, fingerprinted (and precompressed) static assets"""
         output_static = os.path.join(OUTPUT_DIR, 'static')
-        # if os.path.exists(output_static):
-        #     shutil.rmtree(output_static)
-        # shutil.copytree(STATIC_DIR, output_static)
-        
-        # Ensure static dir exists in output
         ensure_dir(output_static)
         
-        # Copy files individually to avoid permission errors on Windows if directory is locked
-        for item in os.listdir(STATIC_DIR):
-            s = os.path.join(STATIC_DIR, item)
-            d = os.path.join(output_static, item)
-            if os.path.isfile(s):
-                shutil.copy2(s, d)
+        self.assets = AssetPipeline(STATIC_DIR, output_static).build()
         
         # Create .nojekyll file
-        with open(os.path.join(OUTPUT_DIR, '.nojekyll'), 'w') as f:
-            pass
+        write_if_changed(os.path.join(OUTPUT_DIR, '.nojekyll'), '')
             
-        print("Copied static assets and created .nojekyll")
+        print("Published static assets and created .nojekyll")
+
+# Per-process state of rebuild_all() workers
+_worker_builder = None
+_worker_store = None
+
+def _init_rebuild_worker():
+    global _worker_builder, _worker_store
+    from src.storage.article_store import ArticleStore
+    _worker_builder = HtmlBuilder()
+    _worker_store = ArticleStore()
+
+def _rebuild_date(date_obj, force):
+    articles = _worker_store.articles_for_date(date_obj)
+    entry, written = _worker_builder.render_daily_page(date_obj, articles, force)
+    # Only what the parent needs to update the manifest and search index, packed
+    # (cheaper to pass between processes than pickled objects)
+    return date_obj, pack_articles(articles, PAGE_FIELDS), entry, written
+
+def rebuild_all(force=False, workers=None):
+    """
+    Re-render every date page in the article store across a process pool,
+    then rebuild the index page. Dates older than MAX_HISTORY_DAYS go into
+    their monthly archives instead. Pages whose inputs (articles, templates,
+    assets) are unchanged are skipped unless force is set. Manifest and
+    search index are updated in this process once the workers are done.
+    Returns the number of pages written.
+    """
+    from src.storage.article_store import ArticleStore
+    builder = HtmlBuilder()
+    builder.copy_static_assets()   # Workers read the fresh asset mapping from disk
+
+    cutoff = builder.retention_cutoff()
+    store = ArticleStore()
+    dates = store.report_dates()
+    expired = [d for d in dates if d.strftime('%Y-%m-%d') < cutoff]
+    dates = [d for d in dates if d.strftime('%Y-%m-%d') >= cutoff]
+    # One month in memory at a time
+    months = set()
+    for month in sorted({d.strftime('%Y-%m') for d in expired}):
+        days = {d.strftime('%Y-%m-%d'): store.articles_for_date(d) for d in expired if d.strftime('%Y-%m') == month}
+        months |= builder.compact_days(days, force)
+    store.close()
+    for month in sorted(set(builder.manifest.months) - months):
+        builder.render_month_page(month, builder._load_month_data(month), force)
+
+    workers = workers or Config.SITE_BUILD_WORKERS or os.cpu_count() or 1
+    workers = max(1, min(workers, len(dates)))
+    print(f"Rebuilding {len(dates)} date pages with {workers} worker(s)...")
+
+    if workers == 1:
+        _init_rebuild_worker()
+        results = [_rebuild_date(d, force) for d in dates]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_rebuild_worker) as pool:
+            results = list(pool.map(_rebuild_date, dates, [force] * len(dates)))
+
+    written = 0
+    for date_obj, packed, entry, page_written in results:
+        builder.record_daily_page(date_obj.strftime('%Y-%m-%d'), unpack_articles(packed), entry)
+        written += page_written
+    builder.compact_history()
+    builder.manifest.save()
+    builder.build_index_page()
+    print(f"Rebuild done: {written}/{len(dates)} pages written")
+    return written
 
 # Example usage (for testing)
 if __name__ == "__main__":
@@ -147,31 +539,31 @@ if __name__ == "__main__":
     
     # Headlines
     for i in range(5):
-        mock_articles.append({
-            'title': f'今日头条新闻 {i+1}',
-            'summary': '这是一条非常重要的新闻摘要，涵盖了AI与运动科学的最新突破。',
-            'summary_short': '重要新闻摘要...',
-            'url': 'https://example.com',
-            'source': '机器之心',
-            'category': 'AI前沿',
-            'category_code': 'ai',
-            'importance': 9,
-            'tags': ['AI', 'Top']
-        })
+        mock_articles.append(Article(
+            title=f'今日头条新闻 {i+1}',
+            summary='这是一条非常重要的新闻摘要，涵盖了AI与运动科学的最新突破。',
+            summary_short='重要新闻摘要...',
+            url='https://example.com',
+            source='机器之心',
+            category='AI前沿',
+            category_code='ai',
+            importance=9,
+            tags=['AI', 'Top']
+        ))
         
     # Standard articles
     for i in range(50):
-        mock_articles.append({
-            'title': f'普通新闻标题 {i+1}',
-            'summary': '这是一条普通的新闻摘要。',
-            'summary_short': '普通新闻摘要...',
-            'url': 'https://example.com',
-            'source': 'Reddit',
-            'category': '装备评测' if i % 2 == 0 else '运动科学',
-            'category_code': 'gear' if i % 2 == 0 else 'science',
-            'importance': 5 + (i % 3), # Random importance 5-7
-            'tags': ['News']
-        })
+        mock_articles.append(Article(
+            title=f'普通新闻标题 {i+1}',
+            summary='这是一条普通的新闻摘要。',
+            summary_short='普通新闻摘要...',
+            url='https://example.com',
+            source='Reddit',
+            category='装备评测' if i % 2 == 0 else '运动科学',
+            category_code='gear' if i % 2 == 0 else 'science',
+            importance=5 + (i % 3), # Random importance 5-7
+            tags=['News']
+        ))
     
     builder.copy_static_assets()
     builder.build_daily_page(today, mock_articles)
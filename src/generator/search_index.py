@@ -0,0 +1,160 @@
+import os
+import re
+import json
+
+SEARCH_DIR_NAME = 'search'
+CJK_BUCKETS = 64   # CJK terms are spread over this many shards by first character
+
+# Keep in sync with tokenize() in static/search.js
+_LATIN_RE = re.compile(r'[a-z0-9]+')
+_CJK_RUN_RE = re.compile(r'[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]+')
+
+# Article fields that are searchable
+INDEXED_FIELDS = ('title', 'title_zh', 'summary_zh', 'summary_short')
+
+def tokenize(text):
+    """
+    Latin words (2+ chars) plus CJK character bigrams; a lone CJK character
+    is kept as a unigram. Queries are tokenized the same way in search.js.
+    """
+    text = (text or '').lower()
+    terms = {w for w in _LATIN_RE.findall(text) if len(w) > 1}
+    for run in _CJK_RUN_RE.findall(text):
+        if len(run) == 1:
+            terms.add(run)
+        terms.update(run[i:i + 2] for i in range(len(run) - 1))
+    return terms
+
+def shard_key(term):
+    """Shard a term by its first character; same rule as shardKey() in search.js"""
+    ch = term[0]
+    if 'a' <= ch <= 'z':
+        return ch
+    if '0' <= ch <= '9':
+        return '0'
+    return f"c{ord(ch) % CJK_BUCKETS}"
+
+class SearchIndex:
+    """
+    Static inverted index for client-side search, under output/search/:
+        docs-<date>.json   [{title, title_zh, url, source}] for one day
+        idx-<shard>.json   {term: ["<date>:<n>", ...]} for terms in that shard
+    plus, in state_dir (not published), terms-<date>.json with the terms a
+    day is indexed under, so its postings can be replaced.
+
+    update_day() only touches the shards that contain terms of the old or
+    new version of that day, so each run costs roughly one day's worth of
+    work no matter how much history there is.
+    """
+    def __init__(self, output_dir, state_dir):
+        self.dir = os.path.join(output_dir, SEARCH_DIR_NAME)
+        self.state_dir = state_dir
+
+    def _docs_path(self, date_str):
+        return os.path.join(self.dir, f"docs-{date_str}.json")
+
+    def _shard_path(self, key):
+        return os.path.join(self.dir, f"idx-{key}.json")
+
+    def _terms_path(self, date_str):
+        return os.path.join(self.state_dir, f"terms-{date_str}.json")
+
+    def _load(self, path, default):
+        if not os.path.exists(path):
+            return default
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Warning: Could not read search file {path}: {e}")
+            return default
+
+    def _write(self, path, data):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+
+    def has_day(self, date_str):
+        return os.path.exists(self._docs_path(date_str))
+
+    def indexed_days(self):
+        if not os.path.exists(self.dir):
+            return []
+        return sorted(m.group(1) for m in (re.match(r'docs-(\d{4}-\d{2}-\d{2})\.json$', f)
+                                           for f in os.listdir(self.dir)) if m)
+
+    def update_day(self, date_str, articles):
+        """(Re)index the articles of one day"""
+        os.makedirs(self.dir, exist_ok=True)
+        os.makedirs(self.state_dir, exist_ok=True)
+        docs = []
+        doc_terms = []
+        for article in articles:
+            terms = set()
+            for field in INDEXED_FIELDS:
+                terms |= tokenize(article.get(field))
+            for tag in article.get('tags') or []:
+                terms |= tokenize(tag)
+            doc_terms.append(terms)
+            # Only what search.js renders
+            docs.append({
+                'title': article.get('title', ''),
+                'title_zh': article.get('title_zh', ''),
+                'url': article.get('url', ''),
+                'source': article.get('source', ''),
+            })
+        day_terms = self._replace_day(date_str, doc_terms)
+        self._write(self._docs_path(date_str), docs)
+        self._write(self._terms_path(date_str), day_terms)
+
+    def remove_day(self, date_str):
+        """Drop a day (e.g. outside the retained history) from the index"""
+        if not self.has_day(date_str):
+            return
+        self._replace_day(date_str, [])
+        os.remove(self._docs_path(date_str))
+        if os.path.exists(self._terms_path(date_str)):
+            os.remove(self._terms_path(date_str))
+
+    def _old_terms(self, date_str):
+        """Terms the day is indexed under now; None if unknown"""
+        terms = self._load(self._terms_path(date_str), None)
+        if terms is None and self.has_day(date_str):
+            # Docs written before the terms moved to state_dir carry their own
+            old_docs = self._load(self._docs_path(date_str), [])
+            if all('terms' in doc for doc in old_docs):
+                terms = [t for doc in old_docs for t in doc['terms']]
+        return terms
+
+    def _replace_day(self, date_str, doc_terms):
+        """Swap the day's postings for doc_terms (one term set per doc). Returns the day's sorted terms."""
+        prefix = f"{date_str}:"
+
+        new_postings = {}
+        for n, terms in enumerate(doc_terms):
+            for term in terms:
+                new_postings.setdefault(term, []).append(f"{prefix}{n}")
+
+        old_terms = self._old_terms(date_str)
+        if old_terms is None and self.has_day(date_str):
+            # Terms file lost (e.g. fresh data/ with a restored site): clean every shard
+            affected = {m.group(1) for m in (re.match(r'idx-(.+)\.json$', f) for f in os.listdir(self.dir)) if m}
+        else:
+            old_terms = set(old_terms or [])
+            affected = {shard_key(t) for t in old_terms}
+        affected |= {shard_key(t) for t in new_postings}
+
+        for key in affected:
+            path = self._shard_path(key)
+            shard = self._load(path, {})
+            stale = list(shard) if old_terms is None else [t for t in old_terms if t in shard and shard_key(t) == key]
+            for term in stale:
+                shard[term] = [d for d in shard[term] if not d.startswith(prefix)]
+            for term, doc_ids in new_postings.items():
+                if shard_key(term) == key:
+                    shard[term] = shard.get(term, []) + doc_ids
+            shard = {t: ids for t, ids in shard.items() if ids}
+            if shard:
+                self._write(path, dict(sorted(shard.items())))
+            elif os.path.exists(path):
+                os.remove(path)
+        return sorted(new_postings)
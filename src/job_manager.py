@@ -0,0 +1,211 @@
+import os
+import re
+import sys
+import time
+import itertools
+import threading
+import traceback
+import subprocess
+import contextlib
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+
+MAX_JOB_HISTORY = 20     # Finished jobs kept for /api/jobs
+MAX_JOB_EVENTS = 2000    # Per job; older log lines are dropped (sequence numbers keep counting)
+
+# "[Step 2] Extracting, Filtering and Deduplicating..." lines printed by src.main
+_STAGE_RE = re.compile(r'^\[Step (\d+)\]\s*(.*?)\.*$')
+
+class Job:
+    """One pipeline run. Events are {'seq', 'type', 'data'} dicts, type being log, stage or status."""
+    def __init__(self, job_id):
+        self.id = job_id
+        self.status = 'queued'          # queued -> running -> succeeded / failed
+        self.stage = None
+        self.returncode = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.requests = 1               # Run requests coalesced into this job
+        self.events = []
+        self.next_seq = 0
+
+    @property
+    def done(self):
+        return self.status in ('succeeded', 'failed')
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'status': self.status,
+            'stage': self.stage,
+            'returncode': self.returncode,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'requests': self.requests,
+        }
+
+class _LineTee:
+    """stdout replacement: passes writes through and reports each complete line"""
+    def __init__(self, stream, on_line):
+        self.stream = stream
+        self.on_line = on_line
+        self._buffer = ''
+        self._lock = threading.Lock()
+
+    def write(self, text):
+        if self.stream is not None:
+            self.stream.write(text)
+        with self._lock:
+            self._buffer += text
+            *lines, self._buffer = self._buffer.split('\n')
+        for line in lines:
+            self.on_line(line)
+        return len(text)
+
+    def flush(self):
+        if self.stream is not None:
+            self.stream.flush()
+        with self._lock:
+            line, self._buffer = self._buffer, ''
+        if line:
+            self.on_line(line)
+
+class JobManager:
+    """
+    Runs the collection pipeline one job at a time, either in-process via
+    runner (e.g. PipelineWorker.run) or as a python -m src.main subprocess.
+
+    submit() starts a job when idle. While one is running, further requests
+    are coalesced into a single queued job, which runs next and so picks up
+    any configuration saved in the meantime. Output lines and "[Step N]"
+    stage changes are recorded as events that subscribers can wait for.
+    """
+    def __init__(self, runner=None, command=None, cwd=BASE_DIR):
+        self.runner = runner
+        self.command = command or [sys.executable, '-u', '-m', 'src.main']
+        self.cwd = cwd
+        self.jobs = {}                  # id -> Job, oldest first
+        self.current = None
+        self.pending = None
+        self._ids = itertools.count(1)
+        self._cond = threading.Condition()
+
+    def submit(self):
+        """Request a run. Returns (job, outcome), outcome being 'started', 'queued' or 'coalesced'."""
+        with self._cond:
+            if self.pending is not None:
+                self.pending.requests += 1
+                return self.pending, 'coalesced'
+            job = self._new_job()
+            if self.current is None:
+                self._start(job)
+                return job, 'started'
+            self.pending = job
+            return job, 'queued'
+
+    def get(self, job_id):
+        with self._cond:
+            return self.jobs.get(job_id)
+
+    def list_jobs(self):
+        with self._cond:
+            return {
+                'current': self.current.id if self.current else None,
+                'pending': self.pending.id if self.pending else None,
+                'jobs': [job.to_dict() for job in reversed(list(self.jobs.values()))],
+            }
+
+    def events_since(self, job, seq, timeout=None):
+        """
+        Events of a job with sequence number >= seq, waiting up to timeout
+        seconds for new ones. Returns (events, done).
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: job.next_seq > seq or job.done, timeout=timeout)
+            return [e for e in job.events if e['seq'] >= seq], job.done
+
+    def _new_job(self):
+        job = Job(str(next(self._ids)))
+        self.jobs[job.id] = job
+        finished = [j for j in self.jobs.values() if j.done]
+        for old in finished[:max(0, len(finished) - MAX_JOB_HISTORY)]:
+            del self.jobs[old.id]
+        return job
+
+    def _start(self, job):
+        # Called with the lock held
+        self.current = job
+        job.status = 'running'
+        job.started_at = time.time()
+        self._emit(job, 'status', job.to_dict())
+        threading.Thread(target=self._run, args=(job,), name=f'job-{job.id}', daemon=True).start()
+
+    def _emit(self, job, event_type, data):
+        # Called with the lock held
+        job.events.append({'seq': job.next_seq, 'type': event_type, 'data': data})
+        job.next_seq += 1
+        if len(job.events) > MAX_JOB_EVENTS:
+            del job.events[:len(job.events) - MAX_JOB_EVENTS]
+        self._cond.notify_all()
+
+    def _record(self, job, event_type, data):
+        with self._cond:
+            self._emit(job, event_type, data)
+
+    def _line(self, job, line):
+        self._record(job, 'log', line)
+        m = _STAGE_RE.match(line.strip())
+        if m:
+            with self._cond:
+                job.stage = {'step': int(m.group(1)), 'name': m.group(2)}
+                self._emit(job, 'stage', job.stage)
+
+    def _run(self, job):
+        print(f"Job {job.id}: starting pipeline")
+        if self.runner:
+            returncode = self._run_in_process(job)
+        else:
+            returncode = self._run_subprocess(job)
+        self._finish(job, returncode)
+
+    def _run_in_process(self, job):
+        # Only one job runs at a time, so all stdout output in the meantime belongs to it
+        tee = _LineTee(sys.stdout, lambda line: self._line(job, line))
+        returncode = 0
+        with contextlib.redirect_stdout(tee):
+            try:
+                self.runner()
+            except Exception:
+                returncode = 1
+                for line in traceback.format_exc().splitlines():
+                    print(line)
+            tee.flush()
+        return returncode
+
+    def _run_subprocess(self, job):
+        returncode = None
+        try:
+            env = dict(os.environ, PYTHONUNBUFFERED='1', PYTHONIOENCODING='utf-8')
+            with subprocess.Popen(self.command, cwd=self.cwd, env=env, stdout=subprocess.PIPE,
+                                  stderr=subprocess.STDOUT, text=True, encoding='utf-8',
+                                  errors='replace', bufsize=1) as proc:
+                for line in proc.stdout:
+                    self._line(job, line.rstrip('\n'))
+                returncode = proc.wait()
+        except Exception as e:
+            self._record(job, 'log', f"Failed to run pipeline: {e}")
+        return returncode
+
+    def _finish(self, job, returncode):
+        with self._cond:
+            job.returncode = returncode
+            job.status = 'succeeded' if returncode == 0 else 'failed'
+            job.finished_at = time.time()
+            self._emit(job, 'status', job.to_dict())
+            print(f"Job {job.id}: {job.status} (exit code {returncode})")
+            self.current = None
+            if self.pending is not None:
+                job, self.pending = self.pending, None
+                self._start(job)
@@ -1,108 +1,171 @@
 import sys
-import os
+import argparse
 import datetime
+import time
 from src.collector.rss_fetcher import RSSFetcher
 from src.collector.reddit_fetcher import RedditFetcher
 from src.processor.summarizer import Summarizer
-from src.generator.html_builder import HtmlBuilder
+from src.processor.keyword_matcher import KeywordMatcher
+from src.processor.dedup import Deduplicator
+from src.processor.ranker import Ranker
+from src.processor.content_extractor import ContentExtractor
+from src.generator.html_builder import HtmlBuilder, rebuild_all
+from src.storage.article_store import ArticleStore
+from src.streaming import StreamingCollector
 from src.config import Config
+from src import metrics
 
-def main():
+def main(incremental=False):
+    rss_fetcher = RSSFetcher()
+    reddit_fetcher = RedditFetcher()
+    summarizer = Summarizer()
+    builder = HtmlBuilder()
+    try:
+        run_pipeline(rss_fetcher, reddit_fetcher, summarizer, builder, incremental)
+    finally:
+        if summarizer.cache:
+            summarizer.cache.close()
+
+def run_pipeline(rss_fetcher, reddit_fetcher, summarizer, builder, incremental=False):
+    """
+    One collection run. The components are passed in so a long-lived process
+    (see pipeline_worker.py) can reuse them, with their HTTP sessions, LLM
+    cache connection and compiled templates, across runs.
+    An incremental run only fetches the RSS feeds that are due for a poll.
+    A run report (see metrics.py) is written whether or not the run succeeds.
+    """
+    run = metrics.start_run()
+    try:
+        _run_stages(run, rss_fetcher, reddit_fetcher, summarizer, builder, incremental)
+    except Exception:
+        run.finish('failed')
+        raise
+    run.finish('succeeded')
+
+def _run_stages(run, rss_fetcher, reddit_fetcher, summarizer, builder, incremental):
     print("--- AI Sports Daily Generator Started ---")
     
+    store = ArticleStore()
+    try:
+        # Steps 1-3: fetch, filter and summarize, overlapped or one after another
+        if Config.PIPELINE_MODE == 'streaming':
+            processed_articles = StreamingCollector(run, rss_fetcher, reddit_fetcher, summarizer, store,
+                                                    incremental).collect()
+        else:
+            processed_articles = _collect_phased(run, rss_fetcher, reddit_fetcher, summarizer, store, incremental)
+        
+        if processed_articles is None:
+            print("No new articles found! Exiting.")
+            rss_fetcher.save_state()
+            return
+
+        if summarizer.cache:
+            stats = summarizer.cache.stats()
+            print(f"LLM cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%} hit rate)")
+            run.record_cache(stats['hits'], stats['misses'])
+
+        today = datetime.date.today()
+        with run.stage('store_results'):
+            store.save_enriched(processed_articles, today)
+            
+            # The daily page covers everything assigned to today, including earlier runs
+            processed_articles = store.articles_for_date(today)
+    finally:
+        store.close()
+
+    # 4. Generate HTML
+    print("\n[Step 4] Generating HTML...")
+    with run.stage('html'):
+        builder.copy_static_assets()
+        
+        builder.build_daily_page(today, processed_articles)
+        
+        # Days past MAX_HISTORY_DAYS move into their monthly archives
+        builder.compact_history()
+        
+        # Index lists every page and monthly archive recorded in the site manifest (with real article counts)
+        builder.build_index_page()
+    
+    # Only remember feed validators / seen entries once the run has succeeded
+    rss_fetcher.save_state()
+    
+    print("--- Done! ---")
+
+def _collect_phased(run, rss_fetcher, reddit_fetcher, summarizer, store, incremental):
+    """
+    PIPELINE_MODE "phased": every step handles all articles before the next
+    one starts. Returns the processed articles, or None if nothing was fetched.
+    """
     # 1. Fetch Data
     print("\n[Step 1] Fetching data...")
-    rss_fetcher = RSSFetcher()
-    reddit_fetcher = RedditFetcher()
-    
     articles = []
-    articles.extend(rss_fetcher.fetch_all())
-    articles.extend(reddit_fetcher.fetch_all())
+    with run.stage('fetch_rss'):
+        articles.extend(rss_fetcher.fetch_all(rss_fetcher.select_feeds(due_only=incremental)))
+    with run.stage('fetch_reddit'):
+        articles.extend(reddit_fetcher.fetch_all())
     
     print(f"Total raw articles: {len(articles)}")
+    run.count('articles_fetched', len(articles))
+    
+    # Candidates earlier runs had no budget for compete again
+    pending = store.pending()
+    if pending:
+        print(f"Pending articles from earlier runs: {len(pending)}")
+        run.count('articles_pending', len(pending))
+        articles.extend(pending)
     
     if not articles:
-        print("No articles found! Exiting.")
-        return
+        return None
 
-    # 2. Process Data (Deduplication & Filtering)
-    print("\n[Step 2] Filtering and Deduplicating...")
-    unique_articles = []
-    seen_urls = set()
-    
-    kw_pattern = [k.lower() for k in Config.KEYWORDS]
+    # 2. Process Data (Extraction, Filtering & Deduplication)
+    print("\n[Step 2] Extracting, Filtering and Deduplicating...")
+    # Clean text + token-sized snippet from feed HTML, used by every later stage
+    with run.stage('extract'):
+        ContentExtractor().extract_all(articles)
     
-    for a in articles:
-        if a['url'] in seen_urls:
-            continue
-            
-        # Keyword filtering (simple check in title or summary)
-        text_to_check = (a['title'] + " " + a.get('summary', '')).lower()
-        if not any(k in text_to_check for k in kw_pattern):
-            # Skip irrelevant articles? 
-            # For now, let's keep them but mark low score, OR strict filtering?
-            # Let's do strict filtering for now to save LLM tokens
-            # print(f"Skipping irrelevant: {a['title']}")
-            continue
-            
-        seen_urls.add(a['url'])
-        unique_articles.append(a)
+    with run.stage('filter_dedup'):
+        # Keyword relevance (whole-word for Latin, substring for CJK keywords);
+        # strict filtering to save LLM tokens
+        relevant_articles = KeywordMatcher().filter(articles)
+        
+        # Same story from several sources / URLs: keep one representative
+        unique_articles = Deduplicator().dedup(relevant_articles)
         
     print(f"Articles after filtering: {len(unique_articles)}")
+    run.count('articles_relevant', len(relevant_articles))
+    run.count('articles_unique', len(unique_articles))
     
-    # Limit processing to save time/tokens (e.g. top 10 most relevant)
-    # For now, just take first 15
-    articles_to_process = unique_articles[:15]
+    # Skip articles already summarized in an earlier run (under any of their URLs)
+    with run.stage('store_rank'):
+        new_articles = [a for a in unique_articles
+                        if not any(store.is_enriched(u) for u in [a['url']] + a['duplicate_urls'])]
+        print(f"New articles (not enriched before): {len(new_articles)}")
+        store.save_fetched(new_articles)
+        
+        # Fill the LLM budget with the highest-value candidates
+        articles_to_process = Ranker().select(new_articles)
+    run.count('articles_new', len(new_articles))
+    run.count('articles_selected', len(articles_to_process))
 
     # 3. LLM Processing
     print("\n[Step 3] AI Processing (Summarization & Scoring)...")
-    summarizer = Summarizer()
-    processed_articles = []
-    
-    for i, article in enumerate(articles_to_process):
-        print(f"Processing {i+1}/{len(articles_to_process)}...")
-        try:
-            processed = summarizer.process_article(article)
-            processed_articles.append(processed)
-        except Exception as e:
-            print(f"Error processing {article['title']}: {e}")
-            processed_articles.append(article) # Keep original if failed
-
-    # 4. Generate HTML
-    print("\n[Step 4] Generating HTML...")
-    builder = HtmlBuilder()
-    builder.copy_static_assets()
-    
-    today = datetime.date.today()
-    builder.build_daily_page(today, processed_articles)
-    
-    # Update Index (Mock implementation needs real persistence, 
-    # for now we just regenerate index with today's entry. 
-    # In real app, we'd scan output dir for history.)
-    
-    # Scan output dir for existing dates
-    history = []
-    # Use hardcoded path logic matching builder
-    base_output_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'output')
-    
-    if os.path.exists(base_output_dir):
-        for item in os.listdir(base_output_dir):
-            if os.path.isdir(os.path.join(base_output_dir, item)):
-                try:
-                    # Valid date folder?
-                    d = datetime.datetime.strptime(item, '%Y-%m-%d').date()
-                    # Count articles? Simplification: assume 10
-                    history.append((d, 10)) 
-                except ValueError:
-                    continue
-    
-    # Add today if not in history (it should be since we just generated it)
-    if not any(h[0] == today for h in history):
-        history.append((today, len(processed_articles)))
-        
-    builder.build_index_page(history)
-    
-    print("--- Done! ---")
+    deadline = time.time() + Config.LLM_BUDGET_SECONDS if Config.LLM_BUDGET_SECONDS else None
+    with run.stage('llm'):
+        processed_articles = [a for a in summarizer.process_articles(articles_to_process, deadline=deadline) if a]
+    run.count('articles_processed', len(processed_articles))
+    return processed_articles
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="AI Sports Daily generator")
+    parser.add_argument('--rebuild', action='store_true',
+                        help="Re-render all date pages from the article store instead of running the pipeline")
+    parser.add_argument('--force', action='store_true', help="With --rebuild: render unchanged pages too")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="With --rebuild: number of processes (default SITE_BUILD_WORKERS / CPU count)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Only fetch RSS feeds that are due according to their publishing cadence")
+    args = parser.parse_args()
+    if args.rebuild:
+        rebuild_all(force=args.force, workers=args.workers)
+    else:
+        main(incremental=args.incremental)
@@ -0,0 +1,301 @@
+import os
+import re
+import json
+import time
+import datetime
+import threading
+import contextlib
+from src.config import Config
+
+MAX_REPORTS = 200            # Run reports kept in DATA_DIR/reports
+TOTALS_NAME = 'totals.json'  # Running totals over all runs, next to the reports (never pruned)
+SLOWEST_FEEDS_SHOWN = 5      # In the end-of-run summary
+
+# Counters incremented by the pipeline; exported as daily_<name>_total
+COUNTERS = ('articles_fetched', 'articles_pending', 'articles_relevant', 'articles_unique', 'articles_new', 'articles_selected',
+            'articles_processed', 'llm_fallbacks', 'pages_rendered', 'pages_skipped')
+
+class RunMetrics:
+    """
+    Measurements of one pipeline run: stage durations, one record per feed
+    download, Reddit request and LLM call, and the counters above. Thread
+    safe, since fetchers and the summarizer record from worker threads.
+    finish() writes the run report (JSON) to DATA_DIR/reports.
+    """
+    def __init__(self):
+        self.started_at = time.time()
+        self.stages = {}
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.feeds = []
+        self.reddit_requests = []
+        self.llm_calls = []
+        self.cache = {'hits': 0, 'misses': 0}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(name, time.perf_counter() - start)
+
+    def record_stage(self, name, seconds):
+        """Add to a stage's duration (stages entered repeatedly, or timed by the caller)"""
+        with self._lock:
+            self.stages[name] = round(self.stages.get(name, 0.0) + seconds, 3)
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def record_feed(self, name, url, seconds, status, size=0, entries=0, new_entries=0):
+        """status: ok, not_modified, empty, timeout or error"""
+        with self._lock:
+            self.feeds.append({'name': name, 'url': url, 'seconds': round(seconds, 3), 'status': status,
+                               'bytes': size, 'entries': entries, 'new_entries': new_entries})
+
+    def record_reddit_request(self, label, seconds, items=0, retries=0, error=None):
+        with self._lock:
+            self.reddit_requests.append({'label': label, 'seconds': round(seconds, 3), 'items': items,
+                                         'retries': retries, 'error': error})
+
+    def record_llm_call(self, seconds, prompt_tokens, completion_tokens, ok=True, first_token_seconds=None,
+                        estimated=False, error=None):
+        """estimated: token counts were approximated (stream cut off before Ollama's final stats)"""
+        with self._lock:
+            self.llm_calls.append({'seconds': round(seconds, 3), 'prompt_tokens': prompt_tokens,
+                                   'completion_tokens': completion_tokens, 'ok': ok,
+                                   'first_token_seconds': None if first_token_seconds is None
+                                   else round(first_token_seconds, 3),
+                                   'estimated': estimated, 'error': error})
+
+    def record_cache(self, hits, misses):
+        with self._lock:
+            self.cache = {'hits': hits, 'misses': misses}
+
+    def report(self, status):
+        with self._lock:
+            calls = list(self.llm_calls)
+            ok_calls = [c for c in calls if c['ok']]
+            completion = sum(c['completion_tokens'] for c in ok_calls)
+            generation = sum(c['seconds'] - (c['first_token_seconds'] or 0) for c in ok_calls)
+            finished_at = time.time()
+            return {
+                'status': status,
+                'started_at': datetime.datetime.fromtimestamp(self.started_at).isoformat(timespec='seconds'),
+                'finished_at': datetime.datetime.fromtimestamp(finished_at).isoformat(timespec='seconds'),
+                'duration_seconds': round(finished_at - self.started_at, 3),
+                'stages': dict(self.stages),
+                'counters': dict(self.counters),
+                'feeds': list(self.feeds),
+                'reddit_requests': list(self.reddit_requests),
+                'llm': {
+                    'calls': len(calls),
+                    'failures': len(calls) - len(ok_calls),
+                    'prompt_tokens': sum(c['prompt_tokens'] for c in ok_calls),
+                    'completion_tokens': completion,
+                    'seconds': round(sum(c['seconds'] for c in calls), 3),
+                    'tokens_per_second': round(completion / generation, 2) if generation > 0 else 0.0,
+                    'cache_hits': self.cache['hits'],
+                    'cache_misses': self.cache['misses'],
+                    'call_details': calls,
+                },
+            }
+
+    def finish(self, status):
+        """Write the run report and print a short summary. Returns the report path."""
+        report = self.report(status)
+        report_dir = os.path.join(Config.DATA_DIR, 'reports')
+        os.makedirs(report_dir, exist_ok=True)
+        # Microseconds, so back-to-back runs (admin job queue) never share a name
+        stamp = datetime.datetime.fromtimestamp(self.started_at).strftime('%Y%m%d-%H%M%S-%f')
+        path = os.path.join(report_dir, f"run-{stamp}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        _add_to_totals(report_dir, report, path)
+        for old in list_reports(report_dir)[:-MAX_REPORTS]:
+            os.remove(old)
+
+        print(f"\nRun report ({status}, {report['duration_seconds']:.1f}s): {path}")
+        for name, seconds in report['stages'].items():
+            print(f"  {name}: {seconds:.2f}s")
+        llm = report['llm']
+        print(f"  LLM: {llm['calls']} calls ({llm['failures']} failed), {llm['prompt_tokens']} prompt + "
+              f"{llm['completion_tokens']} completion tokens, {llm['tokens_per_second']} tokens/s")
+        slowest = sorted(report['feeds'], key=lambda f: f['seconds'], reverse=True)[:SLOWEST_FEEDS_SHOWN]
+        if slowest:
+            print("  Slowest feeds: " + ", ".join(f"{f['name']} {f['seconds']:.2f}s" for f in slowest))
+        return path
+
+# Metrics of the run in progress. Components record into current(); outside
+# of a run this is a throwaway instance, so recording is always safe.
+_current = RunMetrics()
+
+def current():
+    return _current
+
+def start_run():
+    global _current
+    _current = RunMetrics()
+    return _current
+
+def list_reports(report_dir=None):
+    """Report paths, oldest first"""
+    report_dir = report_dir or os.path.join(Config.DATA_DIR, 'reports')
+    if not os.path.exists(report_dir):
+        return []
+    return [os.path.join(report_dir, f) for f in sorted(os.listdir(report_dir))
+            if re.match(r'run-\d{8}-\d{6}(-\d{6})?\.json$', f)]
+
+# Parsed reports by path, so /metrics does not re-read unchanged files
+_report_cache = {}
+
+def _load_reports():
+    reports = []
+    paths = list_reports()
+    for path in paths:
+        if path not in _report_cache:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    _report_cache[path] = json.load(f)
+            except Exception as e:
+                print(f"Warning: Could not read run report {path}: {e}")
+                continue
+        reports.append(_report_cache[path])
+    for path in set(_report_cache) - set(paths):
+        del _report_cache[path]
+    return reports
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _series(name, labels=None):
+    label_text = ','.join(f'{k}="{_label(v)}"' for k, v in (labels or {}).items())
+    return f"{name}{{{label_text}}}" if label_text else name
+
+# Families exported from the running totals: (name, type, help)
+TOTAL_METRICS = (
+    ('daily_runs_total', 'counter', 'Pipeline runs by final status'),
+    ('daily_run_duration_seconds_total', 'counter', 'Wall-clock time of all runs'),
+    ('daily_stage_duration_seconds', 'summary', 'Time spent per pipeline stage'),
+    ('daily_feed_fetch_seconds', 'summary', 'Feed download and parse latency'),
+    ('daily_feed_bytes_total', 'counter', 'Feed bytes downloaded'),
+    ('daily_feed_fetches_total', 'counter', 'Feed fetches by outcome'),
+    ('daily_reddit_requests_total', 'counter', 'Reddit listing requests by outcome'),
+    ('daily_reddit_request_seconds_total', 'counter', 'Time spent in Reddit requests'),
+    ('daily_llm_calls_total', 'counter', 'LLM calls by outcome'),
+    ('daily_llm_tokens_total', 'counter', 'LLM tokens (partly estimated for cut-off streams)'),
+    ('daily_llm_seconds_total', 'counter', 'Time spent waiting for LLM calls'),
+    ('daily_llm_cache_lookups_total', 'counter', 'LLM cache lookups by result'),
+) + tuple((f'daily_{name}_total', 'counter', name.replace('_', ' ').capitalize()) for name in COUNTERS)
+
+def _report_samples(report):
+    """(series, value) pairs one run adds to the running totals"""
+    yield _series('daily_runs_total', {'status': report['status']}), 1
+    yield _series('daily_run_duration_seconds_total'), report['duration_seconds']
+    for stage, seconds in report['stages'].items():
+        yield _series('daily_stage_duration_seconds_sum', {'stage': stage}), seconds
+        yield _series('daily_stage_duration_seconds_count', {'stage': stage}), 1
+    for f in report['feeds']:
+        yield _series('daily_feed_fetch_seconds_sum', {'feed': f['name']}), f['seconds']
+        yield _series('daily_feed_fetch_seconds_count', {'feed': f['name']}), 1
+        yield _series('daily_feed_bytes_total', {'feed': f['name']}), f['bytes']
+        yield _series('daily_feed_fetches_total', {'feed': f['name'], 'status': f['status']}), 1
+    for q in report['reddit_requests']:
+        yield _series('daily_reddit_requests_total', {'outcome': 'error' if q['error'] else 'ok'}), 1
+    yield _series('daily_reddit_request_seconds_total'), sum(q['seconds'] for q in report['reddit_requests'])
+    llm = report['llm']
+    yield _series('daily_llm_calls_total', {'outcome': 'ok'}), llm['calls'] - llm['failures']
+    yield _series('daily_llm_calls_total', {'outcome': 'failed'}), llm['failures']
+    yield _series('daily_llm_tokens_total', {'kind': 'prompt'}), llm['prompt_tokens']
+    yield _series('daily_llm_tokens_total', {'kind': 'completion'}), llm['completion_tokens']
+    yield _series('daily_llm_seconds_total'), llm['seconds']
+    yield _series('daily_llm_cache_lookups_total', {'result': 'hit'}), llm['cache_hits']
+    yield _series('daily_llm_cache_lookups_total', {'result': 'miss'}), llm['cache_misses']
+    for name in COUNTERS:
+        yield _series(f'daily_{name}_total'), report['counters'].get(name, 0)
+
+def _totals_path(report_dir=None):
+    return os.path.join(report_dir or os.path.join(Config.DATA_DIR, 'reports'), TOTALS_NAME)
+
+def load_totals(report_dir=None):
+    """{series: value} summed over every run so far; {} before the first run"""
+    path = _totals_path(report_dir)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Warning: Could not read metric totals {path}: {e}")
+        return {}
+
+def _add_to_totals(report_dir, report, report_path):
+    """
+    Add a finished run to the running totals, so exported counters keep
+    growing after old reports are pruned. The first time, totals are seeded
+    from the reports already on disk (which include this run).
+    """
+    path = _totals_path(report_dir)
+    if os.path.exists(path):
+        totals = load_totals(report_dir)
+        reports = [report]
+    else:
+        totals = {}
+        reports = []
+        for report_file in list_reports(report_dir):
+            if report_file == report_path:
+                reports.append(report)
+                continue
+            try:
+                with open(report_file, 'r', encoding='utf-8') as f:
+                    reports.append(json.load(f))
+            except Exception as e:
+                print(f"Warning: Could not read run report {report_file}: {e}")
+    for r in reports:
+        for series, value in _report_samples(r):
+            totals[series] = round(totals.get(series, 0) + value, 3)
+    # Replaced atomically: /metrics may read it while a run finishes
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(totals.items())), f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+def prometheus_text():
+    """
+    Prometheus text exposition: counters and summaries from the running
+    totals over all runs (data/reports/totals.json) plus gauges describing
+    the latest run.
+    """
+    totals = load_totals()
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            lines.append(f"{_series(name, labels)} {value}")
+
+    by_family = {}
+    for series, value in totals.items():
+        name = series.split('{', 1)[0]
+        if name.endswith(('_sum', '_count')) and not name.endswith('_total'):
+            name = name.rsplit('_', 1)[0]
+        by_family.setdefault(name, []).append((series, value))
+    for name, kind, help_text in TOTAL_METRICS:
+        metric(name, kind, help_text, [])
+        lines.extend(f"{series} {value}" for series, value in sorted(by_family.get(name, [])))
+
+    reports = _load_reports()
+    if reports:
+        last = reports[-1]
+        finished = datetime.datetime.fromisoformat(last['finished_at']).timestamp()
+        metric('daily_last_run_timestamp_seconds', 'gauge', 'End time of the latest run', [({}, int(finished))])
+        metric('daily_last_run_success', 'gauge', '1 if the latest run succeeded',
+               [({}, int(last['status'] == 'succeeded'))])
+        metric('daily_last_run_duration_seconds', 'gauge', 'Duration of the latest run',
+               [({}, last['duration_seconds'])])
+        metric('daily_last_run_llm_tokens_per_second', 'gauge', 'Completion tokens per second in the latest run',
+               [({}, last['llm']['tokens_per_second'])])
+    return '\n'.join(lines) + '\n'
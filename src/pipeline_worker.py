@@ -0,0 +1,67 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from src.config import Config
+from src.collector.rss_fetcher import RSSFetcher
+from src.collector.reddit_fetcher import RedditFetcher
+from src.collector.feed_state import FeedStateStore
+from src.processor.summarizer import Summarizer
+from src.generator.html_builder import HtmlBuilder
+from src.main import run_pipeline
+
+class PipelineWorker:
+    """
+    Runs the pipeline inside a long-lived process (the admin server) so
+    modules stay imported and components stay warm between runs: HTTP
+    sessions for feeds and Ollama, PRAW client, LLM cache connection and
+    compiled Jinja templates.
+
+    All runs execute on one dedicated thread, which owns the components.
+    Before each run sources.json is reloaded if it changed, and per-run
+    state (feed validators, site manifest, templates, cache stats) is
+    refreshed from disk so a failed run leaves nothing stale behind.
+    """
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pipeline')
+        self._sources_mtime = self._read_sources_mtime()
+        self.rss_fetcher = None
+        self.reddit_fetcher = None
+        self.summarizer = None
+        self.builder = None
+
+    def warm_up(self):
+        """Create the components in the background, ahead of the first run"""
+        return self._executor.submit(self._create_components)
+
+    def run(self):
+        """Run the pipeline on the worker thread; blocks until it is done"""
+        return self._executor.submit(self._run).result()
+
+    def _read_sources_mtime(self):
+        path = Config._sources_path
+        return os.path.getmtime(path) if os.path.exists(path) else None
+
+    def _create_components(self):
+        if self.builder is not None:
+            return
+        self.rss_fetcher = RSSFetcher()
+        self.reddit_fetcher = RedditFetcher()
+        self.summarizer = Summarizer()
+        self.builder = HtmlBuilder()
+
+    def _run(self):
+        mtime = self._read_sources_mtime()
+        if mtime != self._sources_mtime:
+            # Fetchers and Ranker read feeds / subreddits / keywords from Config on every run
+            Config.reload()
+            self._sources_mtime = mtime
+
+        if self.builder is None:
+            self._create_components()
+        else:
+            # Discard in-memory state of the previous (possibly failed) run
+            self.rss_fetcher.state = FeedStateStore() if Config.RSS_CONDITIONAL_GET else None
+            self.builder.refresh()
+            if self.summarizer.cache:
+                self.summarizer.cache.reset_stats()
+
+        run_pipeline(self.rss_fetcher, self.reddit_fetcher, self.summarizer, self.builder)
@@ -0,0 +1,98 @@
+import re
+from bs4 import BeautifulSoup
+from src.config import Config
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Elements that never carry article text
+BOILERPLATE_TAGS = ('script', 'style', 'noscript', 'iframe', 'form', 'nav', 'footer', 'aside', 'figure', 'svg',
+                    'button')
+
+# Trailing lines feeds append to every entry
+_BOILERPLATE_RE = re.compile(
+    r'(submitted by\s+/u/\S+.*$'
+    r'|the post .{1,200}? appeared first on .*$'
+    r'|(?:continue|read) (?:reading|more).{0,80}$'
+    r'|阅读原文.*$|点击查看.*$)',
+    re.IGNORECASE | re.DOTALL)
+_WS_RE = re.compile(r'\s+')
+_CJK_RE = re.compile(r'[\u3000-\u9fff\uac00-\ud7af\uff00-\uffef]')
+_SENTENCE_END_RE = re.compile(r'[.!?。！？]\s*')
+
+# Token accounting for the single-article prompt (instructions + JSON answer)
+PROMPT_OVERHEAD_TOKENS = 350
+OUTPUT_RESERVE_TOKENS = 600
+MIN_SNIPPET_TOKENS = 128
+
+def estimate_tokens(text):
+    """Cheap token estimate: ~1 token per CJK character, ~4 chars per token otherwise"""
+    if not text:
+        return 0
+    cjk = len(_CJK_RE.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+def html_to_text(content):
+    """Clean text from an HTML (or plain text) feed body"""
+    if not content:
+        return ''
+    if '<' in content or '&' in content:
+        soup = BeautifulSoup(content, HTML_PARSER)
+        for tag in soup(BOILERPLATE_TAGS):
+            tag.decompose()
+        content = soup.get_text(' ')
+    content = _BOILERPLATE_RE.sub('', content)
+    return _WS_RE.sub(' ', content).strip()
+
+def truncate_tokens(text, max_tokens):
+    """
+    Cut text to roughly max_tokens (see estimate_tokens), preferring to end
+    at a sentence boundary, else a word boundary.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    # Walk characters until the estimate is used up
+    used = 0.0
+    cut = len(text)
+    for i, ch in enumerate(text):
+        used += 1.0 if _CJK_RE.match(ch) else 0.25
+        if used > max_tokens:
+            cut = i
+            break
+    head = text[:cut]
+    sentence_ends = list(_SENTENCE_END_RE.finditer(head))
+    if sentence_ends and sentence_ends[-1].end() > cut * 0.6:
+        return head[:sentence_ends[-1].end()].strip()
+    space = head.rfind(' ')
+    if space > cut * 0.8:
+        head = head[:space]
+    return head.rstrip() + '…'
+
+def snippet_token_budget():
+    """Content tokens per prompt: what num_ctx leaves after instructions and answer, capped"""
+    num_ctx = Config.OLLAMA_OPTIONS.get('num_ctx', 4096)
+    available = num_ctx - PROMPT_OVERHEAD_TOKENS - OUTPUT_RESERVE_TOKENS
+    return max(MIN_SNIPPET_TOKENS, min(Config.LLM_SNIPPET_MAX_TOKENS, available))
+
+class ContentExtractor:
+    """
+    Turns the raw 'summary' of fetched articles (feed HTML, Atom content
+    bodies, reddit selftext) into clean text ('content_text') and a prompt
+    sized snippet ('content_snippet').
+    """
+    def __init__(self, max_tokens=None):
+        self.max_tokens = max_tokens or snippet_token_budget()
+
+    def extract(self, article):
+        text = html_to_text(article.get('summary', ''))
+        article['content_text'] = text
+        article['content_snippet'] = truncate_tokens(text, self.max_tokens)
+        return article
+
+    def extract_all(self, articles):
+        for article in articles:
+            self.extract(article)
+        return articles
@@ -0,0 +1,243 @@
+import re
+import html
+import hashlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from src.config import Config
+
+# Query parameters that only track where a click came from, on any site
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'igshid', 'mc_cid', 'mc_eid', 'ref_src', 'ref_url',
+    'spm', 'share_id', 'cmpid', 'ncid', 'sr_share', 'yclid', '_hsenc', '_hsmi',
+}
+TRACKING_PREFIXES = ('utm_', 'pk_', 'mtm_')
+# Generic names ("source", "ref", ...) select different pages on most sites;
+# they are only dropped on hosts known to use them for tracking
+HOST_TRACKING_PARAMS = {
+    'reddit.com': {'ref', 'ref_source', 'share', 'context'},
+    'medium.com': {'source'},
+    'twitter.com': {'s', 't', 'ref'},
+    'x.com': {'s', 't', 'ref'},
+}
+
+_REDDIT_HOSTS = {'reddit.com', 'old.reddit.com', 'new.reddit.com', 'np.reddit.com', 'm.reddit.com', 'i.reddit.com'}
+_REDDIT_POST_RE = re.compile(r'^/(?:r/[^/]+/)?comments/([a-z0-9]+)', re.IGNORECASE)
+# "[link]" anchor in reddit.com/.rss entry content pointing at the submitted URL
+_REDDIT_RSS_LINK_RE = re.compile(r'<a href="([^"]+)">\[link\]</a>')
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_WORD_RE = re.compile(r'[a-z0-9]+|[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]+')
+_CJK_RE = re.compile(r'[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]')
+
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4   # Distance <= BANDS - 1 guarantees one identical band
+TITLE_WEIGHT = 3    # Title tokens count more than body tokens
+BODY_CHARS = 1000   # Only the start of the body is fingerprinted
+
+def canonicalize_url(url):
+    """
+    Normalize a URL: https, lowercase host without www./m., no default port,
+    fragment or trailing slash, tracking parameters removed (generic names
+    only on HOST_TRACKING_PARAMS hosts) and the rest sorted.
+    Reddit post URLs (any host variant, with or without slug, redd.it) collapse
+    to https://reddit.com/comments/<id>.
+    """
+    url = (url or '').strip()
+    parts = urlsplit(url)
+    if not parts.netloc:
+        return url
+
+    host = parts.hostname or ''
+    for prefix in ('www.', 'm.', 'mobile.'):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    if host in _REDDIT_HOSTS or host == 'redd.it':
+        post_id = reddit_post_id(url)
+        if post_id:
+            return f"https://reddit.com/comments/{post_id}"
+        host = 'reddit.com'
+
+    host_params = HOST_TRACKING_PARAMS.get(host, ())
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if k.lower() not in TRACKING_PARAMS and k.lower() not in host_params
+                   and not k.lower().startswith(TRACKING_PREFIXES))
+    path = re.sub(r'/{2,}', '/', parts.path).rstrip('/') or '/'
+    return urlunsplit(('https', host, path, urlencode(query), ''))
+
+def reddit_post_id(url):
+    """Reddit post id from a permalink or redd.it short link, else None"""
+    parts = urlsplit(url or '')
+    host = (parts.hostname or '').lower()
+    if host == 'redd.it':
+        post_id = parts.path.strip('/')
+        return post_id.lower() or None
+    if host.endswith('reddit.com'):
+        m = _REDDIT_POST_RE.match(parts.path)
+        if m:
+            return m.group(1).lower()
+    return None
+
+def article_url_keys(article):
+    """
+    Every canonical URL identifying an article. Reddit items are known by both
+    their permalink and the URL they link to, so an RSS entry (permalink, with
+    the link in its content) meets the PRAW item (link, with permalink field).
+    """
+    urls = [article.get('url'), article.get('permalink')]
+    if article.get('type') == 'rss' and reddit_post_id(article.get('url')):
+        m = _REDDIT_RSS_LINK_RE.search(article.get('summary') or '')
+        if m:
+            urls.append(html.unescape(m.group(1)))
+    return {canonicalize_url(u) for u in urls if u}
+
+def _tokens(text):
+    """Latin words plus CJK character bigrams"""
+    tokens = []
+    for word in _WORD_RE.findall(text.casefold()):
+        if _CJK_RE.match(word):
+            tokens.extend(word[i:i + 2] for i in range(max(1, len(word) - 1)))
+        else:
+            tokens.append(word)
+    return tokens
+
+def simhash(title, body=''):
+    """64-bit SimHash of title (weighted) and the start of the body"""
+    weights = {}
+    for tok in _tokens(title or ''):
+        weights[tok] = weights.get(tok, 0) + TITLE_WEIGHT
+    body = html.unescape(_TAG_RE.sub(' ', body or ''))[:BODY_CHARS]
+    for tok in _tokens(body):
+        weights[tok] = weights.get(tok, 0) + 1
+    if not weights:
+        return None
+
+    vector = [0] * SIMHASH_BITS
+    for tok, weight in weights.items():
+        h = int.from_bytes(hashlib.blake2b(tok.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(SIMHASH_BITS):
+            vector[bit] += weight if (h >> bit) & 1 else -weight
+    return sum(1 << bit for bit in range(SIMHASH_BITS) if vector[bit] > 0)
+
+class Deduplicator:
+    """
+    Clusters articles that are the same story: identical canonical URLs
+    (see article_url_keys) or SimHash fingerprints within
+    DEDUP_SIMHASH_DISTANCE bits. One representative per cluster is kept.
+    """
+    def __init__(self, max_distance=None):
+        self.max_distance = Config.DEDUP_SIMHASH_DISTANCE if max_distance is None else max_distance
+
+    def dedup(self, articles):
+        """
+        Returns one representative per cluster, in order of first appearance.
+        Representatives get 'duplicate_urls' listing the other members' URLs.
+        """
+        parent = list(range(len(articles)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        def union(i, j):
+            ri, rj = find(i), find(j)
+            if ri != rj:
+                parent[max(ri, rj)] = min(ri, rj)
+
+        # 1. Shared canonical URLs
+        owner = {}
+        for i, article in enumerate(articles):
+            for key in article_url_keys(article):
+                if key in owner:
+                    union(i, owner[key])
+                else:
+                    owner[key] = i
+
+        # 2. Near-duplicate text, candidates found via SimHash bands
+        if self.max_distance >= 0:
+            band_bits = SIMHASH_BITS // SIMHASH_BANDS
+            mask = (1 << band_bits) - 1
+            buckets = {}
+            hashes = [simhash(a['title'], a.get('summary', '')) for a in articles]
+            for i, h in enumerate(hashes):
+                if h is None:
+                    continue
+                for band in range(SIMHASH_BANDS):
+                    bucket = buckets.setdefault((band, (h >> (band * band_bits)) & mask), [])
+                    for j in bucket:
+                        if find(i) != find(j) and bin(h ^ hashes[j]).count('1') <= self.max_distance:
+                            union(i, j)
+                    bucket.append(i)
+
+        clusters = {}
+        for i in range(len(articles)):
+            clusters.setdefault(find(i), []).append(i)
+
+        representatives = []
+        for root in sorted(clusters):
+            members = [articles[i] for i in clusters[root]]
+            best = max(members, key=self._quality)
+            best['duplicate_urls'] = [m['url'] for m in members if m is not best]
+            representatives.append(best)
+
+        removed = len(articles) - len(representatives)
+        if removed:
+            print(f"Dedup: {removed} duplicates removed, {len(representatives)} unique articles")
+        return representatives
+
+    def _quality(self, article):
+        """Prefer the most relevant member, then the one with the most content"""
+        return (article.get('relevance', 0), len(article.get('summary') or ''))
+
+class IncrementalDeduplicator(Deduplicator):
+    """
+    Deduplicator for articles that arrive feed by feed (streaming pipeline).
+    add() compares an article with the clusters seen so far. A cluster's
+    first member stays its representative, since it may already be on its
+    way to the LLM; later members only extend its 'duplicate_urls'.
+    """
+    def __init__(self, max_distance=None):
+        super().__init__(max_distance)
+        self.owner = {}      # Canonical URL -> representative
+        self.buckets = {}    # (band, band value) -> [(simhash, representative)]
+        self.added = 0
+        self.unique = 0
+
+    def add(self, article):
+        """Returns True if the article starts a new cluster, False if it is a duplicate"""
+        self.added += 1
+        keys = article_url_keys(article)
+        rep = next((self.owner[k] for k in keys if k in self.owner), None)
+
+        h = None
+        band_bits = SIMHASH_BITS // SIMHASH_BANDS
+        mask = (1 << band_bits) - 1
+        if rep is None and self.max_distance >= 0:
+            h = simhash(article['title'], article.get('summary', ''))
+            if h is not None:
+                for band in range(SIMHASH_BANDS):
+                    for other_hash, other in self.buckets.get((band, (h >> (band * band_bits)) & mask), []):
+                        if bin(h ^ other_hash).count('1') <= self.max_distance:
+                            rep = other
+                            break
+                    if rep is not None:
+                        break
+
+        if rep is not None:
+            rep['duplicate_urls'].append(article['url'])
+            for key in keys:
+                self.owner.setdefault(key, rep)
+            return False
+
+        article['duplicate_urls'] = []
+        for key in keys:
+            self.owner[key] = article
+        if h is not None:
+            for band in range(SIMHASH_BANDS):
+                self.buckets.setdefault((band, (h >> (band * band_bits)) & mask), []).append((h, article))
+        self.unique += 1
+        return True
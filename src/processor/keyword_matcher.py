@@ -0,0 +1,112 @@
+import re
+import html
+from src.config import Config
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+_CJK_RE = re.compile(r'[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]')
+
+# Relevance weights: a keyword in the title says more than one buried in the body
+TITLE_WEIGHT = 3.0
+BODY_WEIGHT = 1.0
+REPEAT_WEIGHT = 0.25   # Per extra body occurrence
+MAX_REPEATS = 4
+
+class KeywordMatcher:
+    """
+    Matches Config.KEYWORDS with one precompiled regex.
+
+    Latin keywords only match whole words (case-insensitive, optional plural
+    "s", flexible whitespace), so "AI" no longer matches inside "MAIN";
+    adjacent CJK characters count as a word boundary.
+    Keywords containing CJK characters match as plain substrings, since
+    Chinese text has no word separators.
+    """
+    def __init__(self, keywords=None):
+        keywords = Config.KEYWORDS if keywords is None else keywords
+        self.keywords = {}
+        patterns = []
+        for kw in keywords:
+            kw = _WS_RE.sub(' ', kw.strip())
+            if not kw or kw.casefold() in self.keywords:
+                continue
+            self.keywords[kw.casefold()] = kw
+            escaped = r'\s+'.join(re.escape(part) for part in kw.split(' '))
+            if _CJK_RE.search(kw):
+                patterns.append(escaped)
+            else:
+                plural = 's?' if kw[-1].isalpha() else ''
+                # Only Latin letters and digits count as word characters, so "AI"
+                # still matches right next to Chinese text ("用AI训练")
+                patterns.append(rf'(?<![A-Za-z0-9]){escaped}{plural}(?![A-Za-z0-9])')
+        # Longest first so "Zone 2" wins over a shorter overlapping keyword
+        patterns.sort(key=len, reverse=True)
+        self.pattern = re.compile('|'.join(patterns), re.IGNORECASE) if patterns else None
+
+    def _lookup(self, matched):
+        key = _WS_RE.sub(' ', matched).casefold()
+        if key in self.keywords:
+            return self.keywords[key]
+        return self.keywords.get(key[:-1])   # Plural form
+
+    def _find(self, text):
+        counts = {}
+        if self.pattern and text:
+            for m in self.pattern.finditer(text):
+                kw = self._lookup(m.group(0))
+                if kw:
+                    counts[kw] = counts.get(kw, 0) + 1
+        return counts
+
+    def match(self, title, body=''):
+        """
+        Score an article. Returns {'score': float, 'terms': [keyword, ...]};
+        score is 0 when nothing matched.
+        """
+        body = html.unescape(_TAG_RE.sub(' ', body or ''))
+        title_hits = self._find(title or '')
+        body_hits = self._find(body)
+
+        score = 0.0
+        for kw in set(title_hits) | set(body_hits):
+            if kw in title_hits:
+                score += TITLE_WEIGHT
+            if kw in body_hits:
+                score += BODY_WEIGHT + REPEAT_WEIGHT * min(body_hits[kw] - 1, MAX_REPEATS)
+
+        terms = sorted(set(title_hits) | set(body_hits), key=lambda k: (-(k in title_hits), k.casefold()))
+        return {'score': score, 'terms': terms}
+
+    def filter(self, articles, min_score=None):
+        """
+        Articles scoring at least min_score (KEYWORD_MIN_SCORE), with their
+        'relevance' and 'matched_keywords' set. Uses the extracted
+        content_text when present.
+        """
+        min_score = Config.KEYWORD_MIN_SCORE if min_score is None else min_score
+        relevant = []
+        for a in articles:
+            match = self.match(a['title'], a.get('content_text', a.get('summary', '')))
+            if match['score'] < min_score:
+                continue
+            a['relevance'] = match['score']
+            a['matched_keywords'] = match['terms']
+            relevant.append(a)
+        return relevant
+
+if __name__ == "__main__":
+    # Test run: Latin keywords inside and next to Chinese text
+    matcher = KeywordMatcher(['AI', 'Garmin', '马拉松'])
+    cases = [
+        ('用AI训练跑步', ['AI']),
+        ('Garmin发布新款手表', ['Garmin']),
+        ('华为发布AI手表', ['AI']),
+        ('AI 训练', ['AI']),
+        ('MAIN event', []),
+        ('马拉松AI教练', ['AI', '马拉松']),
+    ]
+    for title, expected in cases:
+        terms = matcher.match(title)['terms']
+        print(f"{title!r}: {terms}")
+        assert sorted(terms) == sorted(expected), f"{title!r}: expected {expected}, got {terms}"
+    print("All keyword checks passed")
@@ -0,0 +1,111 @@
+import os
+import re
+import json
+import html
+import time
+import sqlite3
+import hashlib
+import threading
+from src.config import Config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache(last_used);
+"""
+
+_TAG_RE = re.compile(r'<[^>]+>')
+# Footer appended by reddit.com/.rss entries, absent from PRAW selftext
+_REDDIT_FOOTER_RE = re.compile(r'submitted by\s+/u/\S+.*$', re.IGNORECASE | re.DOTALL)
+# Anything that is not a letter/digit (incl. CJK) is treated as a separator
+_NON_WORD_RE = re.compile(r'[\W_]+', re.UNICODE)
+
+def normalize_text(text):
+    """
+    Reduce HTML/markdown/plain renderings of the same text to one form, so
+    a story fetched via the reddit RSS feed and via PRAW hashes the same.
+    """
+    text = html.unescape(_TAG_RE.sub(' ', text or ''))
+    text = _REDDIT_FOOTER_RE.sub('', text)
+    return _NON_WORD_RE.sub(' ', text).strip().casefold()
+
+def cache_key(title, content, *extra):
+    """Content-addressed key: hash of normalized title/content plus anything that changes the output"""
+    h = hashlib.sha256()
+    for part in (normalize_text(title), normalize_text(content)) + tuple(
+            json.dumps(e, sort_keys=True, ensure_ascii=False) for e in extra):
+        h.update(part.encode('utf-8'))
+        h.update(b'\x00')
+    return h.hexdigest()
+
+class LLMCache:
+    """
+    Disk-backed (SQLite) cache of parsed LLM results.
+    Least recently used entries are evicted once the cache exceeds
+    LLM_CACHE_MAX_ENTRIES entries or LLM_CACHE_MAX_BYTES of stored values.
+    """
+    def __init__(self, path=None, max_entries=None, max_bytes=None):
+        self.path = path or Config.LLM_CACHE_PATH
+        self.max_entries = max_entries or Config.LLM_CACHE_MAX_ENTRIES
+        self.max_bytes = max_bytes or Config.LLM_CACHE_MAX_BYTES
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+
+    def get(self, key):
+        with self._lock, self.conn:
+            row = self.conn.execute("SELECT value FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.conn.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def put(self, key, value):
+        data = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute("""
+                INSERT OR REPLACE INTO llm_cache (key, value, size, created_at, last_used)
+                VALUES (?, ?, ?, ?, ?)
+            """, (key, data, len(data.encode('utf-8')), now, now))
+            self._evict()
+
+    def _evict(self):
+        count, total = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in self.conn.execute("SELECT key, size FROM llm_cache ORDER BY last_used").fetchall():
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            self.conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            count -= 1
+            total -= size
+            evicted += 1
+        print(f"  LLM cache: evicted {evicted} least recently used entries")
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self):
+        self.conn.close()
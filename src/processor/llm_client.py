@@ -1,32 +1,178 @@
 import requests
 import json
+import time
 from src.config import Config
+from src import metrics
+from src.processor.content_extractor import estimate_tokens
+
+class JsonStreamScanner:
+    """
+    Incrementally scans streamed text for the first complete top-level JSON
+    value (object or array), so generation can be stopped as soon as it has
+    been received. Anything before the first '{' / '[' (e.g. a ```json fence)
+    is ignored.
+    """
+    def __init__(self):
+        self.text = ''
+        self.start = -1
+        self.end = -1
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk):
+        """Add streamed text; returns True once a complete JSON value has been seen"""
+        pos = len(self.text)
+        self.text += chunk
+        if self.end != -1:
+            return True
+        for i in range(pos, len(self.text)):
+            ch = self.text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"' and self._stack:
+                self._in_string = True
+            elif ch in '{[':
+                if not self._stack and self.start == -1:
+                    self.start = i
+                self._stack.append('}' if ch == '{' else ']')
+            elif ch in '}]' and self._stack:
+                if ch != self._stack[-1]:
+                    # Mismatched bracket: not valid JSON, let the caller's parser deal with it
+                    continue
+                self._stack.pop()
+                if not self._stack:
+                    self.end = i + 1
+                    return True
+        return False
+
+    def result(self):
+        """The complete JSON value if one was found, otherwise all text received"""
+        if self.end != -1:
+            return self.text[self.start:self.end]
+        return self.text
+
+class LLMStallTimeout(Exception):
+    pass
+
+def _set_read_timeout(response, seconds):
+    """
+    Shorten the socket read timeout of an open streaming response. Relies on
+    urllib3 internals, so failure just keeps the original timeout.
+    """
+    try:
+        response.raw._connection.sock.settimeout(seconds)
+    except Exception:
+        pass
 
 class LLMClient:
-    def generate(self, prompt):
+    def __init__(self, pool_size=None):
+        # One pooled keep-alive session shared by all (possibly concurrent) calls
+        pool_size = pool_size or Config.LLM_MAX_IN_FLIGHT
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def generate(self, prompt, json_mode=False):
         """
         Generate text using Ollama API.
+        json_mode asks Ollama to constrain the output to JSON ("format": "json").
+        With Config.LLM_STREAM the response is streamed and cut off as soon as
+        a complete JSON value has arrived.
+        Every call is recorded in the run metrics (latency, tokens, outcome).
         """
+        start_time = time.time()
+        # Token counts come from Ollama's final stats when available
+        call = {'prompt_tokens': None, 'completion_tokens': None, 'chunks': 0, 'first_token_seconds': None}
         try:
             payload = {
                 "model": Config.OLLAMA_MODEL,
                 "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": 0.3, # Low temperature for more deterministic output
-                    "num_ctx": 4096      # Context window
-                }
+                "stream": Config.LLM_STREAM,
+                "options": Config.OLLAMA_OPTIONS
             }
-            # Timeout set to 3 minutes as local inference can be slow
-            response = requests.post(Config.OLLAMA_API_URL, json=payload, timeout=180)
-            response.raise_for_status()
-            
-            result = response.json()
-            return result.get('response', '')
-            
+            if json_mode:
+                payload["format"] = "json"
+
+            if Config.LLM_STREAM:
+                text = self._generate_stream(payload, call, start_time)
+            else:
+                # Timeout set to 3 minutes as local inference can be slow
+                response = self.session.post(Config.OLLAMA_API_URL, json=payload, timeout=180)
+                response.raise_for_status()
+
+                result = response.json()
+                self._read_stats(result, call)
+                text = result.get('response', '')
+            self._record_call(call, start_time, prompt, text)
+            return text
+
         except requests.exceptions.ConnectionError:
             print(f"Error: Could not connect to Ollama at {Config.OLLAMA_API_URL}. Is it running?")
+            self._record_call(call, start_time, prompt, '', error='ConnectionError')
             return ""
         except Exception as e:
             print(f"Error calling Ollama: {e}")
+            self._record_call(call, start_time, prompt, '', error=e.__class__.__name__)
             return ""
+
+    def _read_stats(self, result, call):
+        """Token counts from Ollama's final response object"""
+        if 'eval_count' in result:
+            call['prompt_tokens'] = result.get('prompt_eval_count', 0)
+            call['completion_tokens'] = result['eval_count']
+
+    def _record_call(self, call, start_time, prompt, text, error=None):
+        # A stream cut off early has no final stats: one chunk is one token
+        estimated = call['completion_tokens'] is None
+        completion = call['chunks'] if estimated and call['chunks'] else call['completion_tokens']
+        metrics.current().record_llm_call(
+            time.time() - start_time,
+            prompt_tokens=estimate_tokens(prompt) if call['prompt_tokens'] is None else call['prompt_tokens'],
+            completion_tokens=completion if completion is not None else estimate_tokens(text),
+            ok=bool(text) and error is None,
+            first_token_seconds=call['first_token_seconds'],
+            estimated=estimated,
+            error=error or (None if text else 'EmptyResponse'))
+
+    def _generate_stream(self, payload, call, start_time):
+        """
+        Read Ollama's NDJSON stream. The first token may take up to
+        LLM_FIRST_TOKEN_TIMEOUT (prompt evaluation); after that every token must
+        arrive within LLM_STALL_TIMEOUT. Closing the response early makes Ollama
+        stop generating.
+        """
+        scanner = JsonStreamScanner()
+        timeout = (Config.LLM_CONNECT_TIMEOUT, Config.LLM_FIRST_TOKEN_TIMEOUT)
+        with self.session.post(Config.OLLAMA_API_URL, json=payload, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            first_token = True
+            try:
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get('error'):
+                        raise RuntimeError(chunk['error'])
+                    if first_token:
+                        _set_read_timeout(response, Config.LLM_STALL_TIMEOUT)
+                        call['first_token_seconds'] = time.time() - start_time
+                        first_token = False
+                    call['chunks'] += 1
+                    if chunk.get('done'):
+                        self._read_stats(chunk, call)
+                    if scanner.feed(chunk.get('response', '')):
+                        break
+                    if chunk.get('done'):
+                        break
+            except requests.exceptions.ConnectionError as e:
+                # Read timeouts mid-stream surface as ConnectionError
+                stage = "first token" if first_token else "next token"
+                raise LLMStallTimeout(f"Generation stalled waiting for {stage} ({e})")
+        return scanner.result()
@@ -0,0 +1,78 @@
+import math
+import datetime
+from src.config import Config
+from src.processor.summarizer import BATCH_OUTPUT_TOKENS_PER_ITEM
+from src.processor.content_extractor import estimate_tokens
+
+# Weights of the cheap pre-LLM signals (summing to 1 before the source weight)
+RELEVANCE_WEIGHT = 0.5
+RECENCY_WEIGHT = 0.3
+ENGAGEMENT_WEIGHT = 0.2
+
+RELEVANCE_HALF_POINT = 3.0    # Keyword score at which the relevance signal reaches 0.5
+ENGAGEMENT_SATURATION = 1000  # Reddit score + 2 * comments counted as "maximal"
+
+class Ranker:
+    """
+    Orders candidate articles by cheap signals (keyword relevance, recency,
+    Reddit engagement, per-source weight from sources.json) and fills the LLM
+    budget with the highest-value ones.
+    """
+    def __init__(self, now=None):
+        self.now = now or datetime.datetime.now()
+        self.source_weights = {}
+        for feed in Config.RSS_FEEDS:
+            self.source_weights[feed['name']] = feed.get('weight', 1.0)
+        for sub in Config.REDDIT_SUBREDDITS:
+            self.source_weights[f"r/{sub['name']}"] = sub.get('weight', 1.0)
+
+    def priority(self, article):
+        relevance = article.get('relevance', 0)
+        relevance = relevance / (relevance + RELEVANCE_HALF_POINT)
+
+        recency = 0.0
+        published = article.get('published_at')
+        if isinstance(published, datetime.datetime):
+            age_hours = max(0.0, (self.now - published).total_seconds() / 3600)
+            recency = 0.5 ** (age_hours / Config.RANK_RECENCY_HALF_LIFE_HOURS)
+
+        engagement = 0.0
+        if article.get('type') == 'reddit':
+            raw = max(0, article.get('score') or 0) + 2 * (article.get('num_comments') or 0)
+            engagement = min(1.0, math.log1p(raw) / math.log1p(ENGAGEMENT_SATURATION))
+
+        weight = self.source_weights.get(article.get('source'), 1.0)
+        return weight * (RELEVANCE_WEIGHT * relevance + RECENCY_WEIGHT * recency + ENGAGEMENT_WEIGHT * engagement)
+
+    def estimated_tokens(self, article):
+        """Approximate prompt + completion tokens the article will cost"""
+        content = article.get('content_snippet', article.get('summary') or '')
+        return estimate_tokens(article['title']) + estimate_tokens(content) + BATCH_OUTPUT_TOKENS_PER_ITEM
+
+    def select(self, articles, max_articles=None, max_tokens=None):
+        """
+        Rank all candidates and return the best ones, highest priority first,
+        within max_articles (LLM_BUDGET_ARTICLES) and max_tokens
+        (LLM_BUDGET_TOKENS, 0 = unlimited). Articles that do not fit the token
+        budget are skipped in favour of cheaper, lower-ranked ones.
+        """
+        max_articles = Config.LLM_BUDGET_ARTICLES if max_articles is None else max_articles
+        max_tokens = Config.LLM_BUDGET_TOKENS if max_tokens is None else max_tokens
+
+        for article in articles:
+            article['priority'] = round(self.priority(article), 4)
+        ranked = sorted(articles, key=lambda a: a['priority'], reverse=True)
+
+        selected = []
+        used_tokens = 0
+        for article in ranked:
+            if max_articles and len(selected) >= max_articles:
+                break
+            cost = self.estimated_tokens(article)
+            if max_tokens and used_tokens + cost > max_tokens:
+                continue
+            selected.append(article)
+            used_tokens += cost
+
+        print(f"Selected {len(selected)}/{len(articles)} articles for LLM (~{used_tokens} tokens)")
+        return selected
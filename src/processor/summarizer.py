@@ -1,22 +1,176 @@
 from src.processor.llm_client import LLMClient
+from src.processor.llm_cache import LLMCache, cache_key
+from src.processor.content_extractor import ContentExtractor, estimate_tokens
+from src.config import Config
+from src import metrics
 import json
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Bump whenever the prompts below change so cached results are not reused
+PROMPT_VERSION = 1
+
+# Rough token accounting for packing batches into num_ctx
+BATCH_PROMPT_OVERHEAD_TOKENS = 400   # Instruction block of the batch prompt
+BATCH_ITEM_OVERHEAD_TOKENS = 30      # "[n] Title: ... Suggested Category: ..." framing
+BATCH_OUTPUT_TOKENS_PER_ITEM = 400   # Expected JSON object per article (Chinese summary)
 
 class Summarizer:
     def __init__(self):
         self.llm = LLMClient()
+        self.cache = LLMCache() if Config.LLM_CACHE_ENABLED else None
+        self.extractor = ContentExtractor()
+
+    def process_articles(self, articles, max_workers=None, batch_size=None, deadline=None):
+        """
+        Process many articles with up to max_workers (default LLM_MAX_IN_FLIGHT)
+        requests in flight. Cache hits are resolved up front; short articles are
+        packed into multi-article prompts of up to batch_size (default
+        LLM_BATCH_SIZE) items. Failures fall back to _fallback_enrichment.
+        Jobs run in input order; once the deadline (a time.time() value) has
+        passed, jobs that have not started yet are skipped and their articles
+        come back as None.
+        Returns the processed articles in input order.
+        """
+        max_workers = max_workers or Config.LLM_MAX_IN_FLIGHT
+        batch_size = batch_size or Config.LLM_BATCH_SIZE
+        results = [None] * len(articles)
+
+        pending = self._resolve_cached(articles, results)
+        if self.cache and len(pending) < len(articles):
+            print(f"LLM cache hits: {len(articles) - len(pending)}/{len(articles)}")
+        if not pending:
+            return results
+
+        jobs = self._plan_batches(pending, batch_size)
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs)))) as executor:
+            futures = {}
+            for job in jobs:
+                items = [item for _, item in job]
+                futures[executor.submit(self._run_job, items, deadline)] = job
+
+            done = 0
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    processed = future.result()
+                except Exception as e:
+                    print(f"Error processing batch of {len(job)}: {e}")
+                    processed = [self._fallback_enrichment(item['article']) for _, item in job]
+                for (i, _), article in zip(job, processed):
+                    results[i] = article
+                done += len(job)
+                print(f"Processed {done}/{len(pending)}")
+
+        skipped = sum(1 for r in results if r is None)
+        if skipped:
+            print(f"LLM deadline reached: {skipped} articles left for a later run")
+        return results
+
+    def process_group(self, articles, batch_size=None, deadline=None):
+        """
+        Process a few articles in the calling thread: cache hits first, the
+        rest packed into prompts as in process_articles. Workers of the
+        streaming pipeline call this for every group of candidates they take.
+        Returns the processed articles in input order (None if skipped at the
+        deadline).
+        """
+        batch_size = batch_size or Config.LLM_BATCH_SIZE
+        results = [None] * len(articles)
+        pending = self._resolve_cached(articles, results)
+        for job in self._plan_batches(pending, batch_size):
+            try:
+                processed = self._run_job([item for _, item in job], deadline)
+            except Exception as e:
+                print(f"Error processing batch of {len(job)}: {e}")
+                processed = [self._fallback_enrichment(item['article']) for _, item in job]
+            for (i, _), article in zip(job, processed):
+                results[i] = article
+        return results
+
+    def _resolve_cached(self, articles, results):
+        """Fill results with cache hits; returns (index, item) pairs still needing the LLM"""
+        pending = []
+        for i, article in enumerate(articles):
+            item = self._prepare(article)
+            data = self.cache.get(item['key']) if self.cache else None
+            if data is not None:
+                results[i] = self._apply_enrichment(article, data, item['suggested_cat'])
+            else:
+                pending.append((i, item))
+        return pending
+
+    def _run_job(self, items, deadline):
+        if deadline and time.time() > deadline:
+            return [None] * len(items)
+        if len(items) == 1:
+            return [self._generate_single(items[0])]
+        return self._process_batch(items)
 
     def process_article(self, article):
         """
         Process an article to generate summary, title, score, etc.
-        Returns the modified article dict.
+        Returns the modified article.
         """
-        print(f"Processing: {article['title'][:30]}... ({article['source']})")
-        
-        # Prepare content (truncate to avoid exceeding context window)
-        # 1 token ~= 4 chars, 4096 tokens ~= 16000 chars. 
-        # Safe limit: 3000 chars of content
+        item = self._prepare(article)
+        data = self.cache.get(item['key']) if self.cache else None
+        if data is not None:
+            print(f"  LLM cache hit: {article['title'][:30]}...")
+            return self._apply_enrichment(article, data, item['suggested_cat'])
+        return self._generate_single(item)
+
+    def _prepare(self, article):
+        """Build the content snippet and cache key shared by single and batched prompts"""
+        # Clean, token-truncated content (normally built by the extraction stage in main.py)
+        if 'content_snippet' not in article:
+            self.extractor.extract(article)
+        content_snippet = article['content_snippet']
         suggested_cat = article.get('suggested_category', 'AI前沿')
+        key = cache_key(article['title'], content_snippet, suggested_cat,
+                        Config.OLLAMA_MODEL, Config.OLLAMA_OPTIONS, PROMPT_VERSION)
+        return {
+            'article': article,
+            'content_snippet': content_snippet,
+            'suggested_cat': suggested_cat,
+            'key': key,
+            'tokens': estimate_tokens(article['title']) + estimate_tokens(content_snippet),
+        }
+
+    def _plan_batches(self, pending, batch_size):
+        """
+        Group (index, item) pairs into jobs. Short items are packed greedily while
+        the estimated prompt plus expected output fits into num_ctx; long items
+        (or batch_size <= 1) get a job of their own.
+        """
+        if batch_size <= 1:
+            return [[p] for p in pending]
+
+        budget = Config.OLLAMA_OPTIONS.get('num_ctx', 4096) - BATCH_PROMPT_OVERHEAD_TOKENS
+        jobs = []
+        batch = []
+        used = 0
+        for index, item in pending:
+            cost = item['tokens'] + BATCH_ITEM_OVERHEAD_TOKENS + BATCH_OUTPUT_TOKENS_PER_ITEM
+            if item['tokens'] > Config.LLM_BATCH_MAX_ITEM_TOKENS:
+                jobs.append([(index, item)])
+                continue
+            if batch and (len(batch) >= batch_size or used + cost > budget):
+                jobs.append(batch)
+                batch = []
+                used = 0
+            batch.append((index, item))
+            used += cost
+        if batch:
+            jobs.append(batch)
+        return jobs
+
+    def _generate_single(self, item):
+        """Run the single-article prompt for a prepared item (cache already missed)"""
+        article = item['article']
+        content_snippet = item['content_snippet']
+        suggested_cat = item['suggested_cat']
+        print(f"Processing: {article['title'][:30]}... ({article['source']})")
         
         prompt = f"""
         You are an editor for "AI Sports Daily". Analyze the following article and provide a JSON response in Simplified Chinese.
@@ -46,7 +200,7 @@ class Summarizer:
         }}
         """
         
-        response_text = self.llm.generate(prompt)
+        response_text = self.llm.generate(prompt, json_mode=True)
         
         if not response_text:
             print("  LLM generation failed or returned empty.")
@@ -60,34 +214,10 @@ class Summarizer:
                 raise ValueError("No JSON found in response")
                 
             data = json.loads(clean_text)
+            article = self._apply_enrichment(article, data, suggested_cat)
             
-            article['title_zh'] = data.get('title_zh', article['title'])
-            article['summary_zh'] = data.get('summary_zh', article['summary'][:200])
-            article['summary_short'] = article['summary_zh'][:100] + "..."
-            article['comment'] = data.get('one_sentence_comment', '')
-            article['score'] = int(data.get('score', 5))
-            article['tags'] = data.get('tags', [])
-            
-            # Category Mapping
-            cat_map = {
-                "AI前沿": "ai",
-                "运动科学": "science",
-                "装备评测": "gear",
-                "商业投资": "business"
-            }
-            
-            raw_cat = data.get('category', suggested_cat).strip()
-            # Normalize rudimentary
-            if "AI" in raw_cat: raw_cat = "AI前沿"
-            elif "运动" in raw_cat or "科学" in raw_cat or "训练" in raw_cat: raw_cat = "运动科学"
-            elif "装备" in raw_cat: raw_cat = "装备评测"
-            elif "商业" in raw_cat or "投资" in raw_cat: raw_cat = "商业投资"
-            else: raw_cat = suggested_cat # Fallback to suggested if AI hallucinates
-            
-            article['category'] = raw_cat
-            article['category_code'] = cat_map.get(raw_cat, 'ai')
-            article['importance'] = article['score'] # Align with existing logic
-            
+            if self.cache:
+                self.cache.put(item['key'], data)
             return article
             
         except Exception as e:
@@ -95,6 +225,154 @@ class Summarizer:
             print(f"  Raw response: {response_text[:100]}...")
             return self._fallback_enrichment(article)
 
+    def _process_batch(self, items):
+        """
+        Enrich several short articles with one prompt returning a JSON array.
+        Items missing from (or unparseable in) the response are retried singly.
+        Returns the processed articles in item order.
+        """
+        print(f"Processing batch of {len(items)}: " + ", ".join(i['article']['title'][:20] for i in items))
+
+        blocks = []
+        for n, item in enumerate(items, 1):
+            blocks.append(f"""[{n}]
+        Title: {item['article']['title']}
+        Content: {item['content_snippet']}
+        Suggested Category: {item['suggested_cat']}""")
+        articles_text = "\n\n        ".join(blocks)
+
+        prompt = f"""
+        You are an editor for "AI Sports Daily". Analyze each of the following {len(items)} articles and provide a JSON array in Simplified Chinese with exactly one object per article.
+        
+        Articles:
+        {articles_text}
+        
+        Task (for every article):
+        1. Copy the article number (id).
+        2. Translate title to Chinese (title_zh).
+        3. Write a detailed summary in Chinese (3-5 sentences) (summary_zh).
+        4. Write a one-sentence comment/insight (one_sentence_comment).
+        5. Rate importance (1-10) based on relevance to AI or Sports Science (score).
+        6. Assign tags (max 3) (tags).
+        7. Categorize the article into one of: "AI前沿", "运动科学", "装备评测", "商业投资". 
+           You MUST prioritize the article's Suggested Category unless it is clearly wrong.
+        
+        Response Format (JSON ARRAY ONLY):
+        [
+            {{
+                "id": 1,
+                "title_zh": "...",
+                "summary_zh": "...",
+                "one_sentence_comment": "...",
+                "score": 8,
+                "tags": ["Tag1", "Tag2"],
+                "category": "AI前沿"
+            }}
+        ]
+        """
+
+        response_text = self.llm.generate(prompt)
+        by_id = self._match_batch_items(self._extract_json_items(response_text or ''), len(items))
+
+        results = []
+        retried = 0
+        for n, item in enumerate(items, 1):
+            data = by_id.get(n)
+            article = None
+            if data and (data.get('title_zh') or data.get('summary_zh')):
+                try:
+                    article = self._apply_enrichment(item['article'], data, item['suggested_cat'])
+                    if self.cache:
+                        self.cache.put(item['key'], data)
+                except Exception as e:
+                    print(f"  Error applying batch item {n}: {e}")
+                    article = None
+            if article is None:
+                retried += 1
+                article = self._generate_single(item)
+            results.append(article)
+        if retried:
+            print(f"  Batch: {retried}/{len(items)} items retried singly")
+        return results
+
+    def _extract_json_items(self, text):
+        """
+        Pull a list of JSON objects out of a batch response. Tries the whole
+        array first, then falls back to decoding each top-level object on its
+        own so one malformed item does not lose the others.
+        """
+        match = re.search(r'```(?:json)?\s*(.*?)\s*```', text, re.DOTALL)
+        if match:
+            text = match.group(1)
+
+        start = text.find('[')
+        end = text.rfind(']')
+        if start != -1 and end > start:
+            try:
+                data = json.loads(text[start:end+1])
+                if isinstance(data, list):
+                    return [d for d in data if isinstance(d, dict)]
+            except ValueError:
+                pass
+
+        decoder = json.JSONDecoder()
+        items = []
+        pos = text.find('{')
+        while pos != -1:
+            try:
+                obj, end_pos = decoder.raw_decode(text, pos)
+            except ValueError:
+                pos = text.find('{', pos + 1)
+                continue
+            if isinstance(obj, dict):
+                items.append(obj)
+            pos = text.find('{', end_pos)
+        return items
+
+    def _match_batch_items(self, items, expected):
+        """Map parsed objects to 1-based article numbers, by id or else by position"""
+        by_id = {}
+        for item in items:
+            try:
+                by_id.setdefault(int(item.get('id')), item)
+            except (TypeError, ValueError):
+                pass
+        if not by_id and len(items) == expected:
+            by_id = {n: item for n, item in enumerate(items, 1)}
+        return by_id
+
+    def _apply_enrichment(self, article, data, suggested_cat):
+        """Copy parsed LLM fields onto the article"""
+        article['title_zh'] = data.get('title_zh', article['title'])
+        article['summary_zh'] = data.get('summary_zh', self._plain_summary(article)[:200])
+        article['summary_short'] = article['summary_zh'][:100] + "..."
+        article['comment'] = data.get('one_sentence_comment', '')
+        article['score'] = int(data.get('score', 5))
+        article['tags'] = data.get('tags', [])
+        
+        # Category Mapping
+        cat_map = {
+            "AI前沿": "ai",
+            "运动科学": "science",
+            "装备评测": "gear",
+            "商业投资": "business"
+        }
+        
+        raw_cat = data.get('category', suggested_cat).strip()
+        # Normalize rudimentary
+        if "AI" in raw_cat: raw_cat = "AI前沿"
+        elif "运动" in raw_cat or "科学" in raw_cat or "训练" in raw_cat: raw_cat = "运动科学"
+        elif "装备" in raw_cat: raw_cat = "装备评测"
+        elif "商业" in raw_cat or "投资" in raw_cat: raw_cat = "商业投资"
+        else: raw_cat = suggested_cat # Fallback to suggested if AI hallucinates
+        
+        article['category'] = raw_cat
+        article['category_code'] = cat_map.get(raw_cat, 'ai')
+        article['importance'] = article['score'] # Align with existing logic
+        article['enriched'] = True
+        
+        return article
+
     def _extract_json(self, text):
         """Extract JSON part from text using regex or simple search"""
         # Try to find ```json ... ```
@@ -110,14 +388,22 @@ class Summarizer:
             
         return text
 
+    def _plain_summary(self, article):
+        """Article text without HTML, for when the LLM gives us nothing better"""
+        if 'content_text' not in article:
+            self.extractor.extract(article)
+        return article['content_text']
+
     def _fallback_enrichment(self, article):
         """Fallback when LLM fails"""
         article['title_zh'] = article['title']
-        article['summary_zh'] = article['summary'][:200]
-        article['summary_short'] = article['summary'][:100]
+        article['summary_zh'] = self._plain_summary(article)[:200]
+        article['summary_short'] = self._plain_summary(article)[:100]
         article['score'] = 5
         article['importance'] = 5
         article['tags'] = ['Raw']
         article['category'] = 'AI前沿'
         article['category_code'] = 'ai'
+        article['enriched'] = False
+        metrics.current().count('llm_fallbacks')
         return article
@@ -0,0 +1,153 @@
+import os
+import json
+import sqlite3
+import hashlib
+import datetime
+import threading
+from src.config import Config
+from src.processor.dedup import canonicalize_url
+from src.article import Article, ENRICHMENT_FIELDS
+
+# Stored in the enrichment column: the model's enrichment fields plus the
+# LLM score (which replaces the Reddit score); 'enriched' has its own column
+STORED_ENRICHMENT_FIELDS = tuple(f for f in ENRICHMENT_FIELDS if f != 'enriched') + ('score',)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    url_hash TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    summary TEXT,
+    source TEXT,
+    type TEXT,
+    suggested_category TEXT,
+    published_at TEXT,
+    reddit_score INTEGER,
+    num_comments INTEGER,
+    enrichment TEXT,
+    enriched INTEGER NOT NULL DEFAULT 0,
+    report_date TEXT,
+    fetched_at TEXT NOT NULL,
+    enriched_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_articles_report_date ON articles(report_date);
+"""
+
+def url_hash(url):
+    return hashlib.sha1(canonicalize_url(url).encode('utf-8')).hexdigest()
+
+class ArticleStore:
+    """
+    Persistent SQLite store of fetched articles and their LLM enrichment.
+    Keyed by the SHA-1 of the canonical URL so reruns can skip articles
+    that have already been summarized.
+    """
+    def __init__(self, path=None):
+        self.path = path or Config.ARTICLE_DB_PATH
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def is_enriched(self, url):
+        with self._lock:
+            row = self.conn.execute("SELECT enriched FROM articles WHERE url_hash = ?", (url_hash(url),)).fetchone()
+        return bool(row and row['enriched'])
+
+    def save_fetched(self, articles):
+        """
+        Insert fetched fields for new articles; existing rows keep their
+        enrichment and first fetch time (the age pending() goes by).
+        """
+        now = datetime.datetime.now().isoformat(timespec='seconds')
+        rows = []
+        for a in articles:
+            published = a.get('published_at')
+            rows.append((
+                url_hash(a['url']), a['url'], a['title'], a.get('summary', ''), a.get('source'), a.get('type'),
+                a.get('suggested_category'),
+                published.isoformat() if isinstance(published, datetime.datetime) else published,
+                a.get('score') if a.get('type') == 'reddit' else None, a.get('num_comments'), now
+            ))
+        with self._lock, self.conn:
+            self.conn.executemany("""
+                INSERT INTO articles (url_hash, url, title, summary, source, type, suggested_category,
+                                      published_at, reddit_score, num_comments, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url_hash) DO UPDATE SET
+                    title = excluded.title, summary = excluded.summary,
+                    reddit_score = excluded.reddit_score, num_comments = excluded.num_comments
+            """, rows)
+
+    def save_enriched(self, articles, report_date):
+        """
+        Store the enrichment of processed articles and assign them to a report date.
+        Articles that fell back to raw content are kept but not marked as enriched;
+        pending() hands them back for a retry, and an enriched retry moves the
+        article to the report date of that run.
+        """
+        now = datetime.datetime.now().isoformat(timespec='seconds')
+        date_str = report_date.strftime('%Y-%m-%d')
+        rows = []
+        for a in articles:
+            enriched = 1 if a.get('enriched') else 0
+            rows.append((json.dumps(a.to_dict(STORED_ENRICHMENT_FIELDS), ensure_ascii=False), enriched, date_str,
+                         now if enriched else None, url_hash(a['url'])))
+        with self._lock, self.conn:
+            self.conn.executemany("""
+                UPDATE articles SET enrichment = ?, enriched = ?, report_date = ?,
+                                    enriched_at = ?
+                WHERE url_hash = ?
+            """, rows)
+
+    def articles_for_date(self, report_date):
+        """All articles assigned to a report date, as Articles ready for HtmlBuilder"""
+        with self._lock:
+            rows = self.conn.execute("SELECT * FROM articles WHERE report_date = ? ORDER BY fetched_at",
+                                     (report_date.strftime('%Y-%m-%d'),)).fetchall()
+        return [self._row_to_article(r) for r in rows]
+
+    def pending(self, max_age_hours=None):
+        """
+        Articles fetched within max_age_hours (PENDING_MAX_AGE_HOURS) that are
+        not enriched yet: left out by the budget or deadline, or shown with
+        raw content after the LLM failed. Returned as Articles to rank again
+        with the next run's candidates, since fetchers do not return them
+        again (seen entries, 304 responses).
+        """
+        max_age = Config.PENDING_MAX_AGE_HOURS if max_age_hours is None else max_age_hours
+        since = (datetime.datetime.now() - datetime.timedelta(hours=max_age)).isoformat(timespec='seconds')
+        with self._lock:
+            rows = self.conn.execute("SELECT * FROM articles WHERE enriched = 0 AND fetched_at >= ? "
+                                     "ORDER BY fetched_at", (since,)).fetchall()
+        return [self._row_to_article(r) for r in rows]
+
+    def report_dates(self):
+        """Every report date with assigned articles, oldest first, as datetime.date"""
+        with self._lock:
+            rows = self.conn.execute("SELECT DISTINCT report_date FROM articles WHERE report_date IS NOT NULL "
+                                     "ORDER BY report_date").fetchall()
+        return [datetime.datetime.strptime(r['report_date'], '%Y-%m-%d').date() for r in rows]
+
+    def _row_to_article(self, row):
+        data = {
+            'title': row['title'],
+            'summary': row['summary'] or '',
+            'url': row['url'],
+            'source': row['source'],
+            'suggested_category': row['suggested_category'],
+            'published_at': row['published_at'],
+            'type': row['type'],
+            'enriched': bool(row['enriched']),
+        }
+        if row['type'] == 'reddit':
+            data['score'] = row['reddit_score']
+            data['num_comments'] = row['num_comments']
+        if row['enrichment']:
+            enrichment = json.loads(row['enrichment'])
+            data.update((name, enrichment[name]) for name in STORED_ENRICHMENT_FIELDS if name in enrichment)
+        return Article.from_dict(data)
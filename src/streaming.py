@@ -0,0 +1,279 @@
+import time
+import queue
+import heapq
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from src.config import Config
+from src.processor.content_extractor import ContentExtractor
+from src.processor.keyword_matcher import KeywordMatcher
+from src.processor.dedup import IncrementalDeduplicator
+from src.processor.ranker import Ranker
+
+_DONE = object()        # End of the feed queue
+_PENDING = object()     # Source of the stored candidates earlier runs had no budget for
+_POLL_SECONDS = 0.5     # How often blocked stages check whether another stage failed
+
+class PipelineAborted(Exception):
+    """Raised in a stage once another stage has failed"""
+
+class CandidatePool:
+    """
+    Articles waiting for the LLM, highest Ranker priority first, handed out
+    within the LLM budget (LLM_BUDGET_ARTICLES / LLM_BUDGET_TOKENS).
+
+    While sources are still arriving, only the share of the budget matching
+    the share of sources fetched so far can be used, so the first feeds to
+    arrive cannot use up the whole budget before the others were ranked.
+    """
+    def __init__(self, ranker, max_articles=None, max_tokens=None):
+        self.ranker = ranker
+        self.max_articles = Config.LLM_BUDGET_ARTICLES if max_articles is None else max_articles
+        self.max_tokens = Config.LLM_BUDGET_TOKENS if max_tokens is None else max_tokens
+        self.candidates = 0
+        self.taken = 0
+        self.used_tokens = 0
+        self.progress = 0.0
+        self.closed = False
+        self.aborted = False
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def put(self, article):
+        article['priority'] = round(self.ranker.priority(article), 4)
+        with self._cond:
+            heapq.heappush(self._heap, (-article['priority'], next(self._seq), article))
+            self.candidates += 1
+            self._cond.notify()
+
+    def set_progress(self, fraction):
+        """Share of sources fetched so far (0..1)"""
+        with self._cond:
+            self.progress = fraction
+            self._cond.notify_all()
+
+    def close(self):
+        """No more candidates will come; the whole budget is available"""
+        with self._cond:
+            self.closed = True
+            self.progress = 1.0
+            self._cond.notify_all()
+
+    def abort(self):
+        with self._cond:
+            self.aborted = True
+            self._cond.notify_all()
+
+    def take(self, n):
+        """
+        Up to n of the best candidates the budget allows, waiting while there
+        are none. Returns [] once the pool is closed and drained (or the
+        budget is used up) or aborted.
+        """
+        with self._cond:
+            while not self.aborted:
+                batch = self._take_ready(n)
+                if batch or self.closed:
+                    return batch
+                self._cond.wait()
+            return []
+
+    def _take_ready(self, n):
+        # Called with the lock held
+        batch = []
+        while self._heap and len(batch) < n:
+            if self.max_articles and self.taken >= self.max_articles * self.progress:
+                break
+            article = self._heap[0][2]
+            cost = self.ranker.estimated_tokens(article)
+            if self.max_tokens and self.used_tokens + cost > self.max_tokens:
+                # Never fits; cheaper, lower-ranked candidates may
+                heapq.heappop(self._heap)
+                continue
+            if self.max_tokens and self.used_tokens + cost > self.max_tokens * self.progress:
+                break
+            heapq.heappop(self._heap)
+            batch.append(article)
+            self.taken += 1
+            self.used_tokens += cost
+        return batch
+
+class StreamingCollector:
+    """
+    Steps 1-3 of a run (fetch, filter, LLM) as overlapping stages:
+
+        RSS fetch thread --+
+                           +--> feed queue --> filter thread --> CandidatePool --> LLM workers
+        Reddit fetch ------+    (bounded)      extract, keywords,   ranked,          LLM_MAX_IN_FLIGHT
+                                               dedup, store         budgeted
+
+    A feed's articles are filtered, deduplicated and become LLM candidates
+    as soon as the feed arrives, so the LLM works while slower feeds are
+    still downloading and a run takes about max(fetch, LLM) instead of
+    their sum. The bounded feed queue makes fetchers wait whenever the
+    filter stage falls behind. Reddit is fetched on the calling thread,
+    which owns the fetcher's PRAW client (see RedditFetcher._client).
+    """
+    def __init__(self, run, rss_fetcher, reddit_fetcher, summarizer, store, incremental=False):
+        self.run = run
+        self.incremental = incremental
+        self.rss_fetcher = rss_fetcher
+        self.reddit_fetcher = reddit_fetcher
+        self.summarizer = summarizer
+        self.store = store
+        self.extractor = ContentExtractor()
+        self.matcher = KeywordMatcher()
+        self.dedup = IncrementalDeduplicator()
+        self.pool = CandidatePool(Ranker())
+        self.processed = []
+        self.skipped = 0
+        self.fetched = 0
+        self.llm_started = None
+        self._lock = threading.Lock()
+        self._aborted = threading.Event()
+        self._error = None
+
+    def collect(self):
+        """Run the overlapping stages. Returns the processed articles, or None if nothing was fetched."""
+        print("\n[Step 1] Fetching data (filtering and AI processing start as feeds arrive)...")
+        rss_feeds = self.rss_fetcher.select_feeds(due_only=self.incremental)
+        n_sources = len(rss_feeds) + (len(Config.REDDIT_SUBREDDITS) if self.reddit_fetcher.reddit else 0)
+        pending = self.store.pending()
+        deadline = time.time() + Config.LLM_BUDGET_SECONDS if Config.LLM_BUDGET_SECONDS else None
+        workers = max(1, Config.LLM_MAX_IN_FLIGHT)
+        feeds = queue.Queue(maxsize=Config.PIPELINE_QUEUE_SIZE)
+        if pending:
+            # Ranked again alongside the new candidates, ahead of the first feed
+            print(f"Pending articles from earlier runs: {len(pending)}")
+            self.run.count('articles_pending', len(pending))
+            feeds.put((_PENDING, pending))
+            n_sources += 1
+
+        with ThreadPoolExecutor(max_workers=workers + 2, thread_name_prefix='stream') as executor:
+            try:
+                rss = executor.submit(self._guard, self._produce, 'fetch_rss',
+                                      lambda: self.rss_fetcher.iter_fetch(rss_feeds), feeds)
+                filtering = executor.submit(self._guard, self._filter_stage, feeds, n_sources)
+                llm = [executor.submit(self._guard, self._llm_worker, deadline) for _ in range(workers)]
+
+                self._guard(self._produce, 'fetch_reddit', self.reddit_fetcher.iter_fetch, feeds)
+                rss.result()
+                self._put(feeds, _DONE)
+                filtering.result()
+                print("\n[Step 3] Finishing AI Processing (Summarization & Scoring)...")
+                for worker in llm:
+                    worker.result()
+            except PipelineAborted:
+                raise self._error
+            except BaseException as e:
+                self._abort(e)
+                raise
+        if self.llm_started is not None:
+            self.run.record_stage('llm', time.perf_counter() - self.llm_started)
+
+        print(f"Total raw articles: {self.fetched}")
+        print(f"Selected {self.pool.taken}/{self.pool.candidates} articles for LLM (~{self.pool.used_tokens} tokens)")
+        if self.skipped:
+            print(f"LLM deadline reached: {self.skipped} articles left for a later run")
+        self.run.count('articles_selected', self.pool.taken)
+        self.run.count('articles_processed', len(self.processed))
+        if not self.fetched and not pending:
+            return None
+        return self.processed
+
+    def _guard(self, stage, *args):
+        """Run a stage; the first failure stops all other stages"""
+        try:
+            return stage(*args)
+        except PipelineAborted:
+            raise
+        except BaseException as e:
+            self._abort(e)
+            raise
+
+    def _abort(self, error):
+        with self._lock:
+            if self._error is None:
+                self._error = error
+        self._aborted.set()
+        self.pool.abort()
+
+    def _put(self, feeds, item):
+        while not self._aborted.is_set():
+            try:
+                feeds.put(item, timeout=_POLL_SECONDS)
+                return
+            except queue.Full:
+                continue
+        raise PipelineAborted()
+
+    def _get(self, feeds):
+        while not self._aborted.is_set():
+            try:
+                return feeds.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+        raise PipelineAborted()
+
+    def _produce(self, stage, iter_fetch, feeds):
+        start = time.perf_counter()
+        for source, articles in iter_fetch():
+            self._put(feeds, (source, articles))
+        self.run.record_stage(stage, time.perf_counter() - start)
+
+    def _filter_stage(self, feeds, n_sources):
+        done = 0
+        while True:
+            item = self._get(feeds)
+            if item is _DONE:
+                break
+            source, articles = item
+            done += 1
+            if articles:
+                self._admit(articles, fetched=source is not _PENDING)
+            self.pool.set_progress(done / n_sources)
+        self.pool.close()
+
+        print(f"Articles after filtering: {self.dedup.unique} "
+              f"({self.dedup.added - self.dedup.unique} duplicates removed)")
+
+    def _admit(self, articles, fetched=True):
+        """Extract, filter and deduplicate one feed's articles and queue the new ones for the LLM"""
+        run = self.run
+        if fetched:
+            self.fetched += len(articles)
+            run.count('articles_fetched', len(articles))
+        with run.stage('extract'):
+            self.extractor.extract_all(articles)
+
+        with run.stage('filter_dedup'):
+            relevant = self.matcher.filter(articles)
+            unique = [a for a in relevant if self.dedup.add(a)]
+        run.count('articles_relevant', len(relevant))
+        run.count('articles_unique', len(unique))
+
+        # Skip articles already summarized in an earlier run (under any of their URLs)
+        with run.stage('store_rank'):
+            store = self.store
+            new_articles = [a for a in unique
+                            if not any(store.is_enriched(u) for u in [a['url']] + a['duplicate_urls'])]
+            store.save_fetched(new_articles)
+            for article in new_articles:
+                self.pool.put(article)
+        run.count('articles_new', len(new_articles))
+
+    def _llm_worker(self, deadline):
+        while not (deadline and time.time() > deadline):
+            articles = self.pool.take(Config.LLM_BATCH_SIZE)
+            if not articles:
+                return
+            with self._lock:
+                if self.llm_started is None:
+                    self.llm_started = time.perf_counter()
+            results = self.summarizer.process_group(articles, deadline=deadline)
+            with self._lock:
+                self.processed.extend(a for a in results if a)
+                self.skipped += sum(1 for a in results if a is None)
+                done = len(self.processed)
+            print(f"Processed {done}/{self.pool.taken}")
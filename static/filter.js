@@ -19,8 +19,7 @@ document.addEventListener('DOMContentLoaded', () => {
 
     // 2. Category Filtering
     const filterBtns = document.querySelectorAll('.filter-btn');
-    const headlineCards = document.querySelectorAll('.headline-card');
-    const listItems = document.querySelectorAll('.list-item');
+    let activeCategory = 'all';
 
     filterBtns.forEach(btn => {
         btn.addEventListener('click', () => {
@@ -29,10 +28,11 @@ document.addEventListener('DOMContentLoaded', () => {
             // Add active to current
             btn.classList.add('active');
 
-            const category = btn.getAttribute('data-category');
+            activeCategory = btn.getAttribute('data-category');
 
-            filterItems(category, headlineCards);
-            filterItems(category, listItems);
+            // Query each time so items loaded from archive shards are included
+            filterItems(activeCategory, document.querySelectorAll('.headline-card'));
+            filterItems(activeCategory, document.querySelectorAll('.list-item'));
 
             // Smooth scroll to top content
             window.scrollTo({ top: 0, behavior: 'smooth' });
@@ -53,7 +53,97 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     }
 
-    // 3. Back to Top Button
+    // 3. Lazy-loaded archive shards (archive-0.json, archive-1.json, ...)
+    const archiveLoader = document.getElementById('archiveLoader');
+    if (archiveLoader) {
+        const shardCount = parseInt(archiveLoader.getAttribute('data-shards'), 10) || 0;
+        let remaining = parseInt(archiveLoader.getAttribute('data-remaining'), 10) || 0;
+        const listContainer = document.querySelector('.list-container');
+        const remainingLabel = archiveLoader.querySelector('.archive-remaining');
+        const loadBtn = archiveLoader.querySelector('.archive-btn');
+        let nextShard = 0;
+        let loading = false;
+
+        const loadNextShard = async () => {
+            if (loading || nextShard >= shardCount) return;
+            loading = true;
+            loadBtn.disabled = true;
+            try {
+                const res = await fetch(`archive-${nextShard}.json`);
+                if (!res.ok) throw new Error(res.status);
+                const articles = await res.json();
+                const newItems = articles.map(renderListItem);
+                newItems.forEach(item => listContainer.appendChild(item));
+                filterItems(activeCategory, newItems);
+                nextShard++;
+                remaining = Math.max(0, remaining - articles.length);
+                remainingLabel.textContent = remaining;
+            } catch (e) {
+                console.error('Failed to load archive shard', e);
+            } finally {
+                loading = false;
+                loadBtn.disabled = false;
+            }
+            if (nextShard >= shardCount) {
+                archiveLoader.remove();
+                if (observer) observer.disconnect();
+            }
+        };
+
+        loadBtn.addEventListener('click', loadNextShard);
+
+        // Load automatically when the user scrolls near the end of the list
+        const observer = 'IntersectionObserver' in window
+            ? new IntersectionObserver(entries => {
+                if (entries.some(e => e.isIntersecting)) loadNextShard();
+            }, { rootMargin: '200px' })
+            : null;
+        if (observer) observer.observe(archiveLoader);
+    }
+
+    // Same markup as the list items in daily_template.html
+    function renderListItem(article) {
+        const code = article.category_code || 'ai';
+        const item = document.createElement('article');
+        item.className = `list-item category-border-${code}`;
+        item.setAttribute('data-category', code);
+
+        const content = document.createElement('div');
+        content.className = 'item-content';
+
+        const meta = document.createElement('div');
+        meta.className = 'item-meta';
+        const category = document.createElement('span');
+        category.className = `category-text category-text-${code}`;
+        category.textContent = article.category || '';
+        const source = document.createElement('span');
+        source.className = 'source';
+        source.textContent = article.source || '';
+        meta.append(category, source);
+
+        const title = document.createElement('h3');
+        title.className = 'item-title';
+        const link = document.createElement('a');
+        link.href = article.url;
+        link.target = '_blank';
+        link.textContent = article.title;
+        title.appendChild(link);
+
+        const summary = document.createElement('p');
+        summary.className = 'item-summary';
+        summary.textContent = article.summary_short || '';
+
+        content.append(meta, title, summary);
+
+        const score = document.createElement('div');
+        score.className = 'item-score';
+        score.textContent = article.importance ?? '';
+
+        item.append(content, score);
+        return item;
+    }
+
+    // 4. Back to Top Button
     const backToTopBtn = document.getElementById('backToTop');
 
     window.addEventListener('scroll', () => {
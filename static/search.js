@@ -0,0 +1,112 @@
+// Client-side search over the prebuilt index in search/ (see src/generator/search_index.py)
+document.addEventListener('DOMContentLoaded', () => {
+    const input = document.getElementById('searchInput');
+    const resultsBox = document.getElementById('searchResults');
+    if (!input || !resultsBox) return;
+
+    const CJK_BUCKETS = 64;
+    const MAX_RESULTS = 50;
+    const LATIN_RE = /[a-z0-9]+/g;
+    const CJK_RUN_RE = /[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]+/g;
+
+    // Same rules as tokenize() in search_index.py
+    function tokenize(text) {
+        text = text.toLowerCase();
+        const terms = new Set((text.match(LATIN_RE) || []).filter(w => w.length > 1));
+        (text.match(CJK_RUN_RE) || []).forEach(run => {
+            const chars = Array.from(run);
+            if (chars.length === 1) terms.add(chars[0]);
+            for (let i = 0; i < chars.length - 1; i++) terms.add(chars[i] + chars[i + 1]);
+        });
+        return Array.from(terms);
+    }
+
+    function shardKey(term) {
+        const ch = term[0];
+        if (ch >= 'a' && ch <= 'z') return ch;
+        if (ch >= '0' && ch <= '9') return '0';
+        return 'c' + (term.codePointAt(0) % CJK_BUCKETS);
+    }
+
+    // Each shard / day file is fetched at most once per page view
+    const cache = new Map();
+    function loadJson(url, fallback) {
+        if (!cache.has(url)) {
+            cache.set(url, fetch(url).then(res => (res.ok ? res.json() : fallback)).catch(() => fallback));
+        }
+        return cache.get(url);
+    }
+
+    async function search(query) {
+        const terms = tokenize(query);
+        if (!terms.length) return [];
+        const lastTerm = terms[terms.length - 1];
+
+        const shards = await Promise.all(terms.map(t => loadJson(`search/idx-${shardKey(t)}.json`, {})));
+        let matches = null;
+        terms.forEach((term, i) => {
+            const ids = new Set(shards[i][term] || []);
+            // The last term may still be being typed: match it as a prefix too
+            if (term === lastTerm) {
+                Object.keys(shards[i]).forEach(t => {
+                    if (t.startsWith(term)) shards[i][t].forEach(id => ids.add(id));
+                });
+            }
+            matches = matches === null ? ids : new Set([...matches].filter(id => ids.has(id)));
+        });
+
+        // Newest days first
+        const ids = [...matches].sort().reverse().slice(0, MAX_RESULTS);
+        const days = [...new Set(ids.map(id => id.split(':')[0]))];
+        const docs = await Promise.all(days.map(d => loadJson(`search/docs-${d}.json`, [])));
+        const docsByDay = Object.fromEntries(days.map((d, i) => [d, docs[i]]));
+
+        return ids.map(id => {
+            const [day, n] = id.split(':');
+            const doc = docsByDay[day][Number(n)];
+            return doc ? Object.assign({ date: day }, doc) : null;
+        }).filter(Boolean);
+    }
+
+    function render(results, query) {
+        resultsBox.innerHTML = '';
+        if (!query.trim()) return;
+        if (!results.length) {
+            const empty = document.createElement('p');
+            empty.className = 'search-empty';
+            empty.textContent = '没有找到相关文章';
+            resultsBox.appendChild(empty);
+            return;
+        }
+        results.forEach(doc => {
+            const link = document.createElement('a');
+            link.className = 'archive-item search-result';
+            link.href = doc.url;
+            link.target = '_blank';
+
+            const title = document.createElement('span');
+            title.className = 'search-title';
+            title.textContent = doc.title_zh || doc.title;
+
+            const meta = document.createElement('span');
+            meta.className = 'archive-count';
+            meta.textContent = `${doc.date} · ${doc.source}`;
+
+            link.append(title, meta);
+            resultsBox.appendChild(link);
+        });
+    }
+
+    let timer = null;
+    let latest = 0;
+    input.addEventListener('input', () => {
+        clearTimeout(timer);
+        timer = setTimeout(async () => {
+            const query = input.value;
+            const ticket = ++latest;
+            const results = await search(query);
+            // Ignore answers to queries the user has already typed past
+            if (ticket === latest) render(results, query);
+        }, 120);
+    });
+});